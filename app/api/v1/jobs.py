@@ -0,0 +1,49 @@
+from fastapi import APIRouter, HTTPException
+from app.schema.job_model import JobRequest, JobCreated, JobStatus, JobTaskStatus
+from app.api.v1.reviews import validate_review_request
+from app.utils.jobs import job_manager
+from app.core.config import logger
+
+JobRouter = APIRouter()
+
+
+@JobRouter.post("/jobs", response_model=JobCreated, status_code=202)
+async def create_job(request: JobRequest):
+    if not request.requests:
+        logger.info("Rejected job: no requests given.")
+        raise HTTPException(status_code=400, detail="requests must not be empty.")
+    for review_request in request.requests:
+        validate_review_request(review_request)
+
+    job = await job_manager.submit(request.requests)
+    return JobCreated(job_id=job.id, status=job.status, tasks=len(job.tasks))
+
+
+@JobRouter.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found.")
+
+    tasks = [
+        JobTaskStatus(
+            company_code=task.company_code,
+            start_date=task.start_date,
+            last_date=task.last_date,
+            status=task.status,
+            pages_done=task.pages_done,
+            reviews=task.reviews,
+            overall_review=task.overall_review,
+            error=task.error,
+        )
+        for task in job.tasks
+    ]
+    return JobStatus(
+        job_id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        pages_done=sum(task.pages_done for task in job.tasks),
+        reviews=sum(task.reviews for task in job.tasks),
+        tasks=tasks,
+    )
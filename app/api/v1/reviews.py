@@ -1,132 +1,184 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from app.schema.chatinput import ReviewRequest, ReviewResponse
-from app.schema.review_model import Model
-from app.utils.playwright_utils import fetch_cookies, robust_request
-from app.core.config import settings, logger
-from curl_cffi import requests
+from app.schema.stats_model import ReviewStatsRequest, ReviewStatsResponse
+from app.utils.review_feed import iter_reviews
+from app.utils.review_stats import ReviewStats
+from app.utils.output_sinks import aopen_sink
+from app.utils.metrics import PAGES_PER_REQUEST, REVIEWS, REVIEWS_PER_SECOND, format_trace, start_trace
+from app.core.config import logger
+from contextlib import aclosing
+from typing import Optional
 import json
-from datetime import datetime
-import os  # <--- ADDED
+import time
 
 ReviewRouter = APIRouter()
 
 
-def get_unique_folder_name(base_name):
-    if not os.path.exists(base_name):
-        return base_name
-    i = 1
-    while True:
-        new_name = f"{base_name}_{i}"
-        if not os.path.exists(new_name):
-            return new_name
-        i += 1
+def validate_review_request(request: ReviewRequest):
+    if not request.start_date or not request.last_date:
+        logger.info("Rejected request: start_date and last_date must be provided.")
+        raise HTTPException(status_code=400, detail="start_date and last_date must be provided.")
+    if request.start_date < request.last_date:
+        logger.info("Rejected request: start_date must be >= last_date.")
+        raise HTTPException(status_code=400, detail="start_date must be after or equal to last_date.")
+
+
+def record_request_metrics(pages: int, reviews: int, started: float):
+    elapsed = time.perf_counter() - started
+    PAGES_PER_REQUEST.observe(pages)
+    REVIEWS.inc(reviews)
+    if elapsed > 0:
+        REVIEWS_PER_SECOND.observe(reviews / elapsed)
+    return elapsed
 
 
 @ReviewRouter.post("/reviews", response_model=ReviewResponse)
-async def get_reviews(request: ReviewRequest):
+async def get_reviews(
+    request: ReviewRequest,
+    response: Response,
+    x_scrape_timing: Optional[str] = Header(None),
+):
+    """Send ``X-Scrape-Timing: 1`` to get a per-stage timing breakdown in the response header of the same name."""
     try:
-        if not request.start_date or not request.last_date:
-            logger.info("Rejected request: start_date and last_date must be provided.")
-            raise HTTPException(status_code=400, detail="start_date and last_date must be provided.")
-        if request.start_date < request.last_date:
-            logger.info("Rejected request: start_date must be >= last_date.")
-            raise HTTPException(status_code=400, detail="start_date must be after or equal to last_date.")
-
-        cookies = await fetch_cookies()
-        logger.info(f"Cookies collected and Started scraping {request.company_code}")
-        
-        headers = {
-            "User-Agent": settings.User_Agent,
-            "next-router-state-tree": settings.next_router_state_tree,
-            "rsc": settings.rsc,
-        }
+        validate_review_request(request)
 
+        started = time.perf_counter()
+        trace = start_trace()
         overall_review = {}
         all_reviews = []
-        extracted_data = None
-
-        PAGE = 1
-        reached_cutoff = False
-
-        # --- FOLDER SETUP ---
-        folder_name = get_unique_folder_name(request.company_code)
-        os.makedirs(folder_name)
-        if not os.path.exists(folder_name):
-            os.makedirs(folder_name)
-
-        while not reached_cutoff:
-            REVIEWS_URL = (
-                f"https://www.teamblind.com/company/{request.company_code}/reviews?page={PAGE}"
-            )
-            logger.info(f"Fetching {REVIEWS_URL}")
-
-            resp = await robust_request(
-                REVIEWS_URL,
-                headers=headers,
-                #cookies=cookies,
-            )
-
-            if resp and resp.text:
-                raw_output_string = resp.text
-                lines = raw_output_string.splitlines()
-
-                for line in lines:
-                    stripped_line = line.strip()
-                    if stripped_line.startswith("2:"):
-                        extracted_data = stripped_line[2:].strip()
-                        break
-                if not extracted_data:
-                    logger.error(f"No data found in response for page {PAGE}.")
-                    raise HTTPException(status_code=404, detail=f"No data found in response for page {PAGE}.")
-            else:
-                logger.error(f"Failed to retrieve content or content is empty for page {PAGE}.")
-                raise HTTPException(status_code=502, detail=f"Failed to retrieve content or content is empty for page {PAGE}.")
-
-            try:
-                data = json.loads(extracted_data)
-            except Exception as e:
-                logger.error(f"JSON decode error: {e}")
-                raise HTTPException(status_code=500, detail="Failed to parse review data.")
-
-            try:
-                overall_review = data[0][3]["children"][0][3]
-                reviews = data[0][3]["children"][1][3]["children"][3]["reviews"]["list"]
-            except Exception as e:
-                logger.error(f"Data structure error: {e}")
-                raise HTTPException(status_code=500, detail="Unexpected data structure in review response.")
-
-            # --- SAVE OVERALL REVIEW ON FIRST PAGE ONLY ---
-            if PAGE == 1:
-                with open(os.path.join(folder_name, "page_0.json"), "w", encoding="utf-8") as f:
-                    json.dump(overall_review, f, ensure_ascii=False, indent=2)
-
-            page_reviews = []
-            if reviews:
-                for review in reviews:
-                    review_obj = Model(**review).model_dump()
-                    created_at = datetime.fromisoformat(review_obj["createdAt"].replace("Z", "+00:00")).date()
-                    # Include only reviews within the requested date range
-                    if request.last_date <= created_at <= request.start_date:
-                        all_reviews.append(review_obj)
-                        page_reviews.append(review_obj)
-                # --- SAVE THIS PAGE'S REVIEWS ---
-                with open(os.path.join(folder_name, f"page_{PAGE}.json"), "w", encoding="utf-8") as f:
-                    json.dump(page_reviews, f, ensure_ascii=False, indent=2)
-                # Check last review's createdAt for stopping condition
-                last_review_date = datetime.fromisoformat(reviews[-1]["createdAt"].replace("Z", "+00:00")).date()
-                if last_review_date < request.last_date:
-                    reached_cutoff = True
-                else:
-                    PAGE += 1
-            else:
-                logger.info(f"No reviews found on page {PAGE}.")
-                break
+        pages_scraped = 0
+        sink = None
+
+        batches = iter_reviews(request.company_code, request.start_date, request.last_date)
+        try:
+            async with aclosing(batches):
+                async for batch in batches:
+                    overall_review = batch.overall_review
+                    all_reviews.extend(batch.reviews)
+                    if batch.page is None:
+                        continue
+                    pages_scraped += 1
+
+                    # --- SAVE OVERALL REVIEW ON FIRST FETCHED PAGE ONLY ---
+                    if sink is None:
+                        sink = await aopen_sink(request.company_code)
+                        await sink.write_overall(overall_review)
+
+                    # --- SAVE THIS PAGE'S REVIEWS ---
+                    if batch.page_size:
+                        await sink.write_page(batch.page, batch.reviews)
+        finally:
+            if sink is not None:
+                await sink.close()
+
+        elapsed = record_request_metrics(pages_scraped, len(all_reviews), started)
+        if x_scrape_timing:
+            response.headers["X-Scrape-Timing"] = format_trace(trace, elapsed)
 
         return ReviewResponse(
             overall_review=overall_review,
             reviews=all_reviews
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching reviews: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@ReviewRouter.post("/reviews/stats", response_model=ReviewStatsResponse)
+async def get_review_stats(request: ReviewStatsRequest):
+    """Counts, means and distributions of the rating fields per ``bucket`` over the window.
+
+    Reviews come from the same store-or-scrape feed as ``/reviews`` and are
+    folded into per-bucket histograms batch by batch, so no review text is
+    kept or returned.
+    """
+    try:
+        validate_review_request(request)
+
+        started = time.perf_counter()
+        stats = ReviewStats(request.bucket)
+        pages_scraped = 0
+
+        batches = iter_reviews(request.company_code, request.start_date, request.last_date)
+        async with aclosing(batches):
+            async for batch in batches:
+                stats.add(batch.reviews)
+                pages_scraped += batch.page is not None
+
+        totals = stats.totals()
+        record_request_metrics(pages_scraped, totals.count, started)
+        return ReviewStatsResponse(
+            company_code=request.company_code,
+            start_date=request.start_date,
+            last_date=request.last_date,
+            bucket=request.bucket,
+            count=totals.count,
+            fields=totals.summary(),
+            buckets=stats.bucket_summaries(),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing review stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _ndjson_event(event: str, data) -> str:
+    return json.dumps({"type": event, "data": data}, ensure_ascii=False) + "\n"
+
+
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@ReviewRouter.post("/reviews/stream")
+async def stream_reviews(request: ReviewRequest, http_request: Request):
+    """Stream ``overall_review`` and then every review as soon as its page is parsed.
+
+    Responds with Server-Sent Events when the client accepts ``text/event-stream``
+    and with NDJSON otherwise. The page fetcher only advances as fast as the
+    client reads, so memory stays flat however large the window is. With
+    ``X-Scrape-Timing: 1`` the end event carries the per-stage timing.
+    """
+    validate_review_request(request)
+    want_timing = bool(http_request.headers.get("x-scrape-timing"))
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+    encode = _sse_event if use_sse else _ndjson_event
+
+    async def events():
+        started = time.perf_counter()
+        trace = start_trace()
+        count = 0
+        pages_scraped = 0
+        overall_sent = False
+        batches = iter_reviews(request.company_code, request.start_date, request.last_date)
+        try:
+            async with aclosing(batches):
+                async for batch in batches:
+                    if not overall_sent:
+                        yield encode("overall_review", batch.overall_review)
+                        overall_sent = True
+                    for review in batch.reviews:
+                        yield encode("review", review)
+                    count += len(batch.reviews)
+                    pages_scraped += batch.page is not None
+            if not overall_sent:
+                yield encode("overall_review", {})
+            elapsed = record_request_metrics(pages_scraped, count, started)
+            end = {"count": count}
+            if want_timing:
+                end["timing"] = format_trace(trace, elapsed)
+            yield encode("end", end)
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band.
+            logger.error(f"Error streaming reviews: {e}")
+            detail = e.detail if isinstance(e, HTTPException) else "Internal server error"
+            yield encode("error", {"detail": detail, "count": count})
+
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type, headers={"Cache-Control": "no-cache"})
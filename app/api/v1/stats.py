@@ -0,0 +1,21 @@
+from fastapi import APIRouter
+from app.utils.http_pool import http_pool
+from app.utils.browser_pool import browser_pool
+from app.utils.rate_limit import limiter_stats
+
+StatsRouter = APIRouter()
+
+
+@StatsRouter.get("/stats/http-pool")
+async def get_http_pool_stats():
+    return http_pool.stats()
+
+
+@StatsRouter.get("/stats/browser-pool")
+async def get_browser_pool_stats():
+    return browser_pool.stats()
+
+
+@StatsRouter.get("/stats/rate-limits")
+async def get_rate_limit_stats():
+    return limiter_stats()
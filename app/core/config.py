@@ -7,6 +7,55 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     PORT: int
 
+    # HTTP Client Config
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HOST_REQUESTS_PER_SECOND: float = 5.0  # ceiling of the adaptive per-host rate; 0 = no cap
+    HOST_MIN_REQUESTS_PER_SECOND: float = 0.2  # floor the rate is halved down to on 429/5xx
+    HOST_RATE_INCREASE: float = 0.1  # requests/second regained per successful response
+    HOST_INITIAL_REQUESTS_PER_SECOND: float = 5.0  # assumed rate of an uncapped host throttled before it was measured
+    REQUEST_MAX_RETRIES: int = 10
+    REQUEST_DEADLINE: float = 120.0  # seconds robust_request may spend on one URL, retries included
+    RETRY_BACKOFF_BASE: float = 0.5
+    RETRY_BACKOFF_MAX: float = 30.0
+
+    # Auth Config
+    COOKIE_REFRESH_MARGIN: int = 3600  # seconds before bl_session_v2 expiry to log in again
+    LOGIN_REJECTED_COOLDOWN: int = 300  # seconds without logins after a fresh session is rejected
+    BROWSER_POOL_ENABLED: bool = True  # keep one Chromium warm; disable on low-memory hosts
+    BROWSER_POOL_MAX_CONTEXTS: int = 2
+
+    # Scraper Config
+    TEAMBLIND_BASE_URL: str = "https://www.teamblind.com"  # point at benchmarks/replay_server.py for offline runs
+    PAGE_FETCH_WINDOW: int = 4  # pages kept in flight per scrape
+    PAGE_LOCATOR_ENABLED: bool = True
+    PAGE_LOCATOR_CACHE_TTL: int = 3600  # seconds a cached page->date range is trusted
+
+    # Review Store Config
+    REVIEW_STORE_ENABLED: bool = True
+    REVIEW_STORE_PATH: str = "reviews.db"
+    REVIEW_STORE_FRESHNESS: int = 3600  # seconds a scrape that reached its fetch day is trusted
+    REVIEW_STORE_BATCH_SIZE: int = 500  # reviews read per query when streaming from the store
+
+    # Output Config
+    OUTPUT_FORMAT: str = "auto"  # auto (parquet with pyarrow, else ndjson) | ndjson | parquet | pages (legacy page_N.json folders) | none
+    OUTPUT_DIR: str = "output"
+    OUTPUT_COMPRESSION: str = "gzip"  # gzip | zstd (needs zstandard) for the ndjson sink
+    PARQUET_ROW_GROUP_SIZE: int = 5000
+
+    # Batch Job Config
+    JOB_STORE_PATH: str = "jobs.db"
+    JOB_WORKERS: int = 4  # company tasks scraped concurrently across all jobs
+    JOB_SLICE_PAGES: int = 20  # pages a task scrapes before yielding its worker
+    JOB_LEASE_TTL: int = 120  # seconds a job range lease survives without being renewed
+    JOB_POLL_INTERVAL: float = 5.0  # seconds between looks for tasks queued by other workers
+    JOB_PARTITION: str = "month"  # split job windows into aligned ranges: none | week | month | quarter | year
+
+    # Shared State Config (coordination between uvicorn workers and containers)
+    SHARED_STATE_BACKEND: str = "file"  # file | redis | memory (single worker only)
+    SHARED_STATE_PATH: str = "shared_state.json"  # file backend; must be on storage every worker sees
+    SHARED_STATE_URL: str = "redis://localhost:6379/0"  # redis backend; any Redis-compatible server
+    SHARED_STATE_PREFIX: str = "teamblind:"
+    LOGIN_LOCK_TTL: int = 180  # seconds one worker may hold the login lock
 
     # Header Config
     User_Agent: str = (
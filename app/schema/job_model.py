@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+from datetime import date
+from app.schema.chatinput import ReviewRequest
+
+class JobRequest(BaseModel):
+    requests: List[ReviewRequest]
+
+class JobCreated(BaseModel):
+    job_id: str
+    status: str
+    tasks: int
+
+class JobTaskStatus(BaseModel):
+    company_code: str
+    start_date: date
+    last_date: date
+    status: str
+    pages_done: int
+    reviews: int
+    overall_review: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    created_at: float
+    updated_at: float
+    pages_done: int
+    reviews: int
+    tasks: List[JobTaskStatus]
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import Any  
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, List
+from typing_extensions import TypedDict
+
 
 class Model(BaseModel):
     overall: int
@@ -13,3 +15,22 @@ class Model(BaseModel):
     cons: str
     reasonResign: Any
     createdAt: str
+
+
+class Review(TypedDict):
+    """Same fields and coercion as ``Model``, validated straight into a plain dict."""
+    overall: int
+    career: int
+    balance: int
+    compensation: int
+    culture: int
+    management: int
+    summary: str
+    pros: str
+    cons: str
+    reasonResign: Any
+    createdAt: str
+
+
+# Built once; validating a whole page in one call skips the per-review model instance and model_dump().
+ReviewList = TypeAdapter(List[Review])
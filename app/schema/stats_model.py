@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Literal
+from datetime import date
+from app.schema.chatinput import ReviewRequest
+
+class ReviewStatsRequest(ReviewRequest):
+    bucket: Literal["day", "week", "month", "quarter", "year"] = "month"
+
+class FieldStats(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    distribution: Dict[int, int]
+
+class BucketStats(BaseModel):
+    start: date
+    count: int
+    fields: Dict[str, FieldStats]
+
+class ReviewStatsResponse(BaseModel):
+    company_code: str
+    start_date: date
+    last_date: date
+    bucket: str
+    count: int
+    fields: Dict[str, FieldStats]
+    buckets: List[BucketStats]
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from playwright.async_api import async_playwright
+
+from app.core.config import settings, logger
+from app.utils.metrics import BROWSER_CONTEXT_SECONDS
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+
+def children_rss_bytes() -> Optional[int]:
+    """Resident memory of every descendant process (the browser and its renderers), Linux only."""
+    try:
+        parents: Dict[int, int] = {}
+        for entry in os.listdir("/proc"):
+            if entry.isdigit():
+                try:
+                    with open(f"/proc/{entry}/stat") as f:
+                        # The command name may contain spaces; fields resume after its ")".
+                        parents[int(entry)] = int(f.read().rsplit(")", 1)[1].split()[1])
+                except (OSError, IndexError, ValueError):
+                    continue
+    except OSError:
+        return None
+
+    descendants, frontier = set(), {os.getpid()}
+    while frontier:
+        frontier = {pid for pid, ppid in parents.items() if ppid in frontier} - descendants
+        descendants |= frontier
+
+    total = 0
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for pid in descendants:
+        try:
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+class BrowserPool:
+    """One long-lived Chromium started with the app, handing out fresh contexts.
+
+    At most ``max_contexts`` contexts are open at once. When the pool is not
+    running callers fall back to launching a browser of their own.
+    """
+
+    def __init__(self, enabled: bool, max_contexts: int):
+        self.enabled = enabled
+        self.max_contexts = max_contexts
+        self._playwright = None
+        self._browser = None
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_contexts)
+        self._open_contexts = 0
+        self._contexts_created = 0
+        self._launches = 0
+        self._startup_seconds: Optional[float] = None
+        self._last_context_seconds: Optional[float] = None
+        # Sampled at launch and context creation only; walking /proc is too slow for every stats call.
+        self._rss_bytes: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._browser is not None
+
+    async def _launch(self):
+        started = time.perf_counter()
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        self._launches += 1
+        self._startup_seconds = time.perf_counter() - started
+        self._rss_bytes = rss = await asyncio.to_thread(children_rss_bytes)
+        logger.info(
+            f"Browser pool launched Chromium in {self._startup_seconds:.2f}s"
+            + (f", browser RSS {rss / 2**20:.0f} MiB." if rss is not None else ".")
+        )
+
+    async def start(self):
+        if not self.enabled:
+            logger.info("Browser pool disabled; logins will launch their own browser.")
+            return
+        try:
+            async with self._lock:
+                await self._launch()
+        except Exception as e:
+            logger.error(f"Failed to start browser pool, logins will launch their own browser: {e}")
+            await self.close()
+
+    async def close(self):
+        async with self._lock:
+            browser, self._browser = self._browser, None
+            playwright, self._playwright = self._playwright, None
+            if browser is not None:
+                try:
+                    await browser.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close pooled browser: {e}")
+            if playwright is not None:
+                await playwright.stop()
+            if browser is not None:
+                logger.info("Browser pool closed.")
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser is not None and not self._browser.is_connected():
+                logger.warning("Pooled browser disconnected. Relaunching.")
+                self._browser = None
+            if self._browser is None:
+                await self._launch()
+            return self._browser
+
+    @asynccontextmanager
+    async def context(self, **options: Any):
+        async with self._semaphore:
+            browser = await self._ensure_browser()
+            started = time.perf_counter()
+            context = await browser.new_context(**options)
+            self._last_context_seconds = time.perf_counter() - started
+            BROWSER_CONTEXT_SECONDS.observe(self._last_context_seconds)
+            self._contexts_created += 1
+            self._open_contexts += 1
+            self._rss_bytes = await asyncio.to_thread(children_rss_bytes)
+            logger.info(f"Browser pool created a context in {self._last_context_seconds * 1000:.0f}ms.")
+            try:
+                yield context
+            finally:
+                self._open_contexts -= 1
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close browser context: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "max_contexts": self.max_contexts,
+            "open_contexts": self._open_contexts,
+            "contexts_created": self._contexts_created,
+            "launches": self._launches,
+            "startup_seconds": self._startup_seconds,
+            "last_context_seconds": self._last_context_seconds,
+            "browser_rss_bytes": self._rss_bytes if self.running else None,
+        }
+
+
+browser_pool = BrowserPool(settings.BROWSER_POOL_ENABLED, settings.BROWSER_POOL_MAX_CONTEXTS)
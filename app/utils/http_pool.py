@@ -0,0 +1,79 @@
+from typing import Dict
+from urllib.parse import urlsplit
+from contextlib import asynccontextmanager
+from curl_cffi import requests, CurlInfo
+
+from app.core.config import settings, logger
+
+
+class SessionPool:
+    """Process-wide pool of curl_cffi sessions, one per host.
+
+    Each session keeps up to ``max_per_host`` curl handles alive, so TLS
+    connections are reused across pages and across concurrent API calls.
+    """
+
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max_per_host
+        self._sessions: Dict[str, requests.AsyncSession] = {}
+        self._requests = 0
+        self._new_connections = 0
+        self._in_flight = 0
+
+    async def start(self):
+        logger.info(f"HTTP session pool started (max {self.max_per_host} connections per host).")
+
+    async def close(self):
+        sessions, self._sessions = self._sessions, {}
+        for host, session in sessions.items():
+            try:
+                await session.close()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP session for {host}: {e}")
+        logger.info("HTTP session pool closed.")
+
+    def _get_session(self, host: str) -> requests.AsyncSession:
+        session = self._sessions.get(host)
+        if session is None:
+            session = requests.AsyncSession(
+                max_clients=self.max_per_host,
+                curl_infos=[CurlInfo.NUM_CONNECTS],
+            )
+            self._sessions[host] = session
+            logger.info(f"Opened pooled HTTP session for {host}.")
+        return session
+
+    @asynccontextmanager
+    async def session(self, url: str):
+        host = urlsplit(url).netloc
+        self._in_flight += 1
+        try:
+            yield self._get_session(host)
+        finally:
+            self._in_flight -= 1
+
+    def record(self, resp):
+        self._requests += 1
+        self._new_connections += resp.infos.get(CurlInfo.NUM_CONNECTS, 0) or 0
+
+    @staticmethod
+    def _open_handles(session: requests.AsyncSession) -> int:
+        # Unused slots in the session's handle queue are ``None`` placeholders;
+        # every other slot (queued or checked out) is a live curl handle.
+        idle_slots = sum(1 for curl in list(session.pool._queue) if curl is None)
+        return session.max_clients - idle_slots
+
+    def stats(self) -> Dict[str, object]:
+        reused = max(self._requests - self._new_connections, 0)
+        return {
+            "hosts": len(self._sessions),
+            "max_connections_per_host": self.max_per_host,
+            "requests": self._requests,
+            "new_connections": self._new_connections,
+            "reuse_ratio": round(reused / self._requests, 4) if self._requests else 0.0,
+            "open_connections": sum(self._open_handles(s) for s in self._sessions.values()),
+            "in_flight": self._in_flight,
+        }
+
+
+http_pool = SessionPool(settings.HTTP_MAX_CONNECTIONS_PER_HOST)
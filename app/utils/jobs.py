@@ -0,0 +1,363 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import aclosing
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings, logger
+from app.utils.page_locator import locate_start_page, remember_page
+from app.utils.review_stats import bucket_start
+from app.utils.review_store import review_store
+from app.utils.scraper import iter_window_pages
+from app.utils.shared_state import INSTANCE_ID, shared_state
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_tasks (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "completed", "failed"
+
+
+@dataclass
+class JobTask:
+    job_id: str
+    idx: int
+    company_code: str
+    start_date: str
+    last_date: str
+    status: str = QUEUED
+    # Missing (start_date, last_date) segments still to scrape, newest first;
+    # None until the task first runs and asks the review store.
+    segments: Optional[List[List[str]]] = None
+    next_page: Optional[int] = None  # page to resume the current segment from
+    segment_started_at: Optional[float] = None
+    pages_done: int = 0
+    reviews: int = 0
+    overall_review: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Shared-state lease a worker must hold to scrape this task; tasks of any
+    # job that fall in the same company range share it.
+    lease: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return self.job_id, self.idx
+
+    @property
+    def lease_key(self) -> str:
+        return self.lease or f"range:{self.company_code}:{self.start_date}:{self.last_date}"
+
+
+def partition_window(start_date: date, last_date: date, bucket: str) -> List[Tuple[date, date]]:
+    """Split ``[last_date, start_date]`` at ``bucket`` boundaries (see bucket_start), newest range first."""
+    if bucket == "none":
+        return [(start_date, last_date)]
+    ranges = []
+    end = start_date
+    while end >= last_date:
+        begin = max(bucket_start(end.isoformat(), bucket), last_date)
+        ranges.append((end, begin))
+        end = begin - timedelta(days=1)
+    return ranges
+
+
+@dataclass
+class Job:
+    id: str
+    created_at: float
+    updated_at: float
+    tasks: List[JobTask] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        statuses = {task.status for task in self.tasks}
+        if statuses <= {QUEUED}:
+            return QUEUED
+        if statuses & {QUEUED, RUNNING}:
+            return RUNNING
+        return FAILED if FAILED in statuses else DONE
+
+
+class JobStore:
+    """SQLite persistence for jobs, so a restart resumes tasks from their last finished page."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def save_job(self, job: Job):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO jobs (id, created_at, updated_at) VALUES (?, ?, ?)",
+                    (job.id, job.created_at, job.updated_at),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO job_tasks (job_id, idx, state) VALUES (?, ?, ?)",
+                    [(task.job_id, task.idx, json.dumps(asdict(task))) for task in job.tasks],
+                )
+
+    def save_task(self, task: JobTask, updated_at: float):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (updated_at, task.job_id))
+                conn.execute(
+                    "UPDATE job_tasks SET state = ? WHERE job_id = ? AND idx = ?",
+                    (json.dumps(asdict(task)), task.job_id, task.idx),
+                )
+
+    def load_job(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT created_at, updated_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = Job(job_id, *row)
+            for (state,) in conn.execute("SELECT state FROM job_tasks WHERE job_id = ? ORDER BY idx", (job_id,)):
+                job.tasks.append(JobTask(**json.loads(state)))
+        return job
+
+    def load_task(self, job_id: str, idx: int) -> Optional[JobTask]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT state FROM job_tasks WHERE job_id = ? AND idx = ?", (job_id, idx)).fetchone()
+        return None if row is None else JobTask(**json.loads(row[0]))
+
+    def load_pending_tasks(self) -> List[JobTask]:
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT state FROM job_tasks WHERE json_extract(state, '$.status') IN (?, ?) ORDER BY job_id, idx",
+                (QUEUED, RUNNING),
+            ).fetchall()
+        return [JobTask(**json.loads(state)) for (state,) in rows]
+
+
+class LeaseLost(Exception):
+    pass
+
+
+class JobManager:
+    """Worker pool running batch scrape jobs.
+
+    Each requested window is split into company date ranges (JOB_PARTITION)
+    that become tasks. Tasks are processed in slices of JOB_SLICE_PAGES
+    pages and go to the back of the queue after every slice, so a company
+    with hundreds of pages cannot starve the others. All workers share the
+    per-host rate limit of robust_request.
+
+    The job store is the source of truth, so every worker process on the
+    host can run the same jobs: a slice only runs while its worker holds the
+    task's range lease in the shared state, starts from the state last saved
+    by whichever worker ran the task before, and tasks queued by other
+    processes are picked up every JOB_POLL_INTERVAL seconds.
+    """
+
+    def __init__(self, path: str, workers: int, slice_pages: int):
+        self.store = JobStore(path)
+        self.workers = workers
+        self.slice_pages = slice_pages
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[Tuple[str, int]] = set()  # tasks in this process's queue or running here
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        resumed = self._enqueue(await asyncio.to_thread(self.store.load_pending_tasks))
+        self._worker_tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._worker_tasks.append(asyncio.create_task(self._poll_loop()))
+        logger.info(f"Job workers started ({self.workers} workers, {resumed} task(s) resumed).")
+
+    async def stop(self):
+        for worker in self._worker_tasks:
+            worker.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self.store.close()
+
+    def _enqueue(self, tasks: Iterable[JobTask]) -> int:
+        added = 0
+        for task in tasks:
+            if task.key not in self._queued:
+                self._queued.add(task.key)
+                self._queue.put_nowait(task)
+                added += 1
+        return added
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+            try:
+                added = self._enqueue(await asyncio.to_thread(self.store.load_pending_tasks))
+            except Exception as e:
+                logger.error(f"Failed to poll the job store: {e}")
+                continue
+            if added:
+                logger.info(f"Picked up {added} job task(s) from the job store.")
+
+    async def submit(self, requests: List[Any]) -> Job:
+        now = time.time()
+        job = Job(uuid.uuid4().hex, now, now)
+        bucket = settings.JOB_PARTITION
+        for request in requests:
+            for start_date, last_date in partition_window(request.start_date, request.last_date, bucket):
+                lease = None
+                if bucket != "none":
+                    lease = f"range:{request.company_code}:{bucket}:{bucket_start(last_date.isoformat(), bucket)}"
+                job.tasks.append(JobTask(
+                    job.id, len(job.tasks), request.company_code, start_date.isoformat(), last_date.isoformat(),
+                    lease=lease,
+                ))
+        await asyncio.to_thread(self.store.save_job, job)
+        self._enqueue(job.tasks)
+        logger.info(f"Queued job {job.id} with {len(job.tasks)} task(s).")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await asyncio.to_thread(self.store.load_job, job_id)
+
+    async def _save(self, task: JobTask):
+        await asyncio.to_thread(self.store.save_task, task, time.time())
+
+    def _requeue_later(self, task: JobTask):
+        asyncio.get_running_loop().call_later(settings.JOB_POLL_INTERVAL, self._queue.put_nowait, task)
+
+    async def _worker(self, number: int):
+        owner = f"{INSTANCE_ID}:{number}"
+        while True:
+            task = await self._queue.get()
+            try:
+                if not await shared_state.aclaim(task.lease_key, owner, settings.JOB_LEASE_TTL):
+                    # Another worker is scraping this range; try again once it had time to finish.
+                    self._requeue_later(task)
+                    continue
+                try:
+                    requeue = await self._run_leased(task, owner)
+                finally:
+                    await asyncio.shield(shared_state.arelease(task.lease_key, owner))
+                # Only after the release, so an idle worker of this process can claim it straight away.
+                if requeue:
+                    self._queue.put_nowait(task)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Shared state or job store unavailable; keep the task for a later attempt.
+                logger.error(f"Job {task.job_id} task {task.company_code} could not run: {e}")
+                self._requeue_later(task)
+            finally:
+                self._queue.task_done()
+
+    async def _run_leased(self, task: JobTask, owner: str) -> bool:
+        """Run one slice of ``task`` while holding its lease; return True if it should be requeued."""
+        # Continue from what the last holder of the lease saved, which may be another process.
+        stored = await asyncio.to_thread(self.store.load_task, task.job_id, task.idx)
+        if stored is None or stored.status in (DONE, FAILED):
+            self._queued.discard(task.key)
+            return False
+        task = stored
+
+        lease_lost = False
+        try:
+            task.status = RUNNING
+            finished = await self._run_slice(task, owner)
+            task.status = DONE if finished else QUEUED
+        except asyncio.CancelledError:
+            task.status = QUEUED
+            raise
+        except LeaseLost:
+            lease_lost = True
+            logger.warning(f"Lost the lease on {task.lease_key}; leaving job {task.job_id} task to its new holder.")
+        except Exception as e:
+            logger.error(f"Job {task.job_id} task {task.company_code} failed: {e}")
+            task.status = FAILED
+            task.error = getattr(e, "detail", None) or str(e)
+        finally:
+            if not lease_lost:
+                await asyncio.shield(self._save(task))
+        if task.status == QUEUED or lease_lost:
+            return True
+        self._queued.discard(task.key)
+        return False
+
+    async def _run_slice(self, task: JobTask, owner: str) -> bool:
+        """Scrape up to ``slice_pages`` pages of a task; return True once the task is complete."""
+        if task.next_page is None:
+            # Between segments: another task covering the same range may have filled the store since.
+            task.segments = None
+        if task.segments is None:
+            start_date, last_date = date.fromisoformat(task.start_date), date.fromisoformat(task.last_date)
+            windows = await review_store.amissing_windows(task.company_code, start_date, last_date)
+            task.segments = [[s.isoformat(), l.isoformat()] for s, l in windows]
+            await self._save(task)
+
+        budget = self.slice_pages  # shared by every segment this slice reaches
+        while task.segments:
+            if budget <= 0:
+                return False
+            segment_start, segment_last = (date.fromisoformat(d) for d in task.segments[0])
+            probed: Dict[int, Any] = {}
+            if task.next_page is None:
+                task.segment_started_at = time.time()
+                task.next_page = await locate_start_page(task.company_code, segment_start, probed)
+
+            segment_done = False
+            pages = iter_window_pages(
+                task.company_code, segment_start, segment_last,
+                start_page=task.next_page, max_pages=budget, prefetched=probed,
+            )
+            async with aclosing(pages):
+                async for page in pages:
+                    remember_page(task.company_code, page.page, page.date_range)
+                    await review_store.aadd_page(task.company_code, page.overall_review, page.reviews)
+                    task.overall_review = page.overall_review
+                    task.pages_done += 1
+                    task.reviews += len(page.reviews)
+                    budget -= 1
+                    task.next_page = page.page + 1
+                    segment_done = page.reached_cutoff
+                    if not await shared_state.arenew(task.lease_key, owner, settings.JOB_LEASE_TTL):
+                        raise LeaseLost(task.lease_key)
+                    await self._save(task)
+
+            if not segment_done:
+                return False
+            await review_store.aadd_coverage(task.company_code, segment_start, segment_last, task.segment_started_at)
+            task.segments.pop(0)
+            task.next_page = None
+            task.segment_started_at = None
+        return True
+
+
+job_manager = JobManager(settings.JOB_STORE_PATH, settings.JOB_WORKERS, settings.JOB_SLICE_PAGES)
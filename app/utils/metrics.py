@@ -0,0 +1,121 @@
+"""Prometheus metrics and per-request stage timing for the scrape pipeline.
+
+``timed(stage)`` records a duration in ``scrape_stage_seconds`` and, when a
+trace was started for the current request with ``start_trace()``, adds it to
+that trace as well. Stage durations of concurrent page fetches add up, so a
+trace shows where time went rather than a wall-clock breakdown.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+STAGE_SECONDS = Histogram(
+    "scrape_stage_seconds",
+    "Time spent in each stage of the scrape pipeline.",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "scrape_http_request_seconds",
+    "Latency of upstream HTTP requests by status code.",
+    ["status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20),
+)
+HTTP_RETRIES = Counter("scrape_http_retries_total", "Upstream request retries by reason.", ["reason"])
+LOGINS = Counter("scrape_logins_total", "Browser logins performed.", ["result"])
+PAGES = Counter("scrape_pages_total", "Review pages fetched and parsed.")
+REVIEWS = Counter("scrape_reviews_total", "Reviews returned inside the requested windows.")
+PAGES_PER_REQUEST = Histogram(
+    "scrape_pages_per_request",
+    "Pages scraped per API request.",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+REVIEWS_PER_SECOND = Histogram(
+    "scrape_reviews_per_second",
+    "Reviews delivered per second of API request time.",
+    buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000, 50000),
+)
+BROWSER_CONTEXT_SECONDS = Histogram(
+    "browser_context_create_seconds",
+    "Time to create a browser context for a login.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+
+_trace: ContextVar[Optional[Dict[str, float]]] = ContextVar("scrape_trace", default=None)
+
+
+def start_trace() -> Dict[str, float]:
+    trace: Dict[str, float] = {}
+    _trace.set(trace)
+    return trace
+
+
+def add_to_trace(stage: str, seconds: float):
+    trace = _trace.get()
+    if trace is not None:
+        trace[stage] = trace.get(stage, 0.0) + seconds
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+    add_to_trace(stage, seconds)
+
+
+@contextmanager
+def timed(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def format_trace(trace: Dict[str, float], total: float) -> str:
+    """Render a trace as ``stage=seconds;...;total=seconds`` for the X-Scrape-Timing header."""
+    parts = [f"{stage}={seconds:.4f}" for stage, seconds in sorted(trace.items())]
+    parts.append(f"total={total:.4f}")
+    return ";".join(parts)
+
+
+class PoolCollector:
+    """Exports the live state of the HTTP session pool, browser pool and rate limiters.
+
+    Running totals are counters (exposed with a ``_total`` suffix) so ``rate()`` works on them.
+    """
+
+    def describe(self):
+        # Registration would otherwise call collect(), importing the pools mid-import.
+        return []
+
+    def collect(self):
+        from app.utils.browser_pool import browser_pool
+        from app.utils.http_pool import http_pool
+        from app.utils.rate_limit import limiter_stats
+
+        http = http_pool.stats()
+        for key in ("requests", "new_connections"):
+            yield CounterMetricFamily(f"http_pool_{key}", f"HTTP session pool {key.replace('_', ' ')}.", value=http[key])
+        for key in ("reuse_ratio", "open_connections", "in_flight"):
+            yield GaugeMetricFamily(f"http_pool_{key}", f"HTTP session pool {key.replace('_', ' ')}.", value=http[key])
+
+        browser = browser_pool.stats()
+        for key in ("contexts_created", "launches"):
+            yield CounterMetricFamily(f"browser_pool_{key}", f"Browser pool {key.replace('_', ' ')}.", value=browser[key])
+        for key in ("open_contexts", "startup_seconds", "browser_rss_bytes"):
+            if browser[key] is not None:
+                yield GaugeMetricFamily(f"browser_pool_{key}", f"Browser pool {key.replace('_', ' ')}.", value=browser[key])
+
+        rate = GaugeMetricFamily("host_rate_limit_rps", "Current adaptive request rate per host.", labels=["host"])
+        throttles = CounterMetricFamily("host_throttles", "Throttling responses seen per host.", labels=["host"])
+        for host, stats in limiter_stats().items():
+            rate.add_metric([host], stats["rate"])
+            throttles.add_metric([host], stats["throttles"])
+        yield rate
+        yield throttles
+
+
+REGISTRY.register(PoolCollector())
@@ -0,0 +1,219 @@
+"""Where scraped pages are written on disk.
+
+OUTPUT_FORMAT selects the sink:
+
+- ``auto`` (default): ``parquet`` when pyarrow is installed, ``ndjson`` otherwise
+- ``ndjson``: one append-only ``reviews.ndjson.gz`` (or ``.zst``) per company, safe to share between workers
+- ``parquet``: a Parquet dataset per company with typed rating columns, one part per scrape
+- ``pages``: the original ``<company>/page_N.json`` folder per scrape
+- ``none``: nothing is written
+
+All file I/O runs on a worker thread so the event loop is never blocked.
+"""
+import asyncio
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings, logger
+from app.utils.metrics import timed
+from app.utils.shared_state import file_lock
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pq = None
+
+RATING_FIELDS = ("overall", "career", "balance", "compensation", "culture", "management")
+TEXT_FIELDS = ("summary", "pros", "cons")
+
+
+def make_unique_folder(base_name):
+    """Create and return ``base_name``, or ``base_name_1``, ``base_name_2``... if taken.
+
+    The folder is claimed by creating it, so concurrent workers never end up sharing one.
+    """
+    new_name, i = base_name, 0
+    while True:
+        try:
+            os.makedirs(new_name)
+            return new_name
+        except FileExistsError:
+            i += 1
+            new_name = f"{base_name}_{i}"
+
+
+class OutputSink:
+    """Base sink; subclasses implement the blocking ``_write_*``/``_close`` methods."""
+
+    def _write_overall(self, overall_review: Dict[str, Any]):
+        pass
+
+    def _write_page(self, page: int, reviews: List[Dict[str, Any]]):
+        pass
+
+    def _close(self):
+        pass
+
+    async def write_overall(self, overall_review: Dict[str, Any]):
+        with timed("file_write"):
+            await asyncio.to_thread(self._write_overall, overall_review)
+
+    async def write_page(self, page: int, reviews: List[Dict[str, Any]]):
+        with timed("file_write"):
+            await asyncio.to_thread(self._write_page, page, reviews)
+
+    async def close(self):
+        with timed("file_write"):
+            await asyncio.to_thread(self._close)
+
+
+class PageFileSink(OutputSink):
+    """The original layout: ``page_0.json`` with the overall review and one pretty-printed file per page."""
+
+    def __init__(self, company_code: str):
+        self.folder = make_unique_folder(company_code)
+
+    def _write_overall(self, overall_review):
+        with open(os.path.join(self.folder, "page_0.json"), "w", encoding="utf-8") as f:
+            json.dump(overall_review, f, ensure_ascii=False, indent=2)
+
+    def _write_page(self, page, reviews):
+        with open(os.path.join(self.folder, f"page_{page}.json"), "w", encoding="utf-8") as f:
+            json.dump(reviews, f, ensure_ascii=False, indent=2)
+
+
+class CompanyDirSink(OutputSink):
+    def __init__(self, company_code: str):
+        self.folder = os.path.join(settings.OUTPUT_DIR, company_code)
+        os.makedirs(self.folder, exist_ok=True)
+
+    def _write_overall(self, overall_review):
+        path = os.path.join(self.folder, "overall.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(overall_review, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+
+class NDJSONSink(CompanyDirSink):
+    """Appends compact JSON lines to one compressed file per company.
+
+    Lines are buffered and appended as complete gzip members (or zstd frames)
+    of about FLUSH_BYTES each, which readers decompress transparently as a
+    single stream. Each append is one locked write, so workers scraping the
+    same company concurrently never interleave inside a member.
+    """
+
+    FLUSH_BYTES = 1 << 20
+
+    def __init__(self, company_code: str, compression: str):
+        super().__init__(company_code)
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; falling back to gzip output.")
+            compression = "gzip"
+        if compression == "zstd":
+            self.path = os.path.join(self.folder, "reviews.ndjson.zst")
+            self._compress = zstandard.ZstdCompressor().compress
+        else:
+            self.path = os.path.join(self.folder, "reviews.ndjson.gz")
+            self._compress = lambda data: gzip.compress(data, compresslevel=6)
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        data = self._compress(b"".join(self._buffer))
+        self._buffer, self._buffered = [], 0
+        with file_lock(self.path + ".lock"), open(self.path, "ab") as f:
+            f.write(data)
+
+    def _write_page(self, page, reviews):
+        for review in reviews:
+            line = json.dumps(review, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            self._buffer.append(line)
+            self._buffered += len(line)
+        if self._buffered >= self.FLUSH_BYTES:
+            self._flush()
+
+    def _close(self):
+        self._flush()
+
+
+class ParquetSink(CompanyDirSink):
+    """Writes one ``reviews.parquet/part-<timestamp>-<pid>.parquet`` per scrape, buffering rows into large row groups.
+
+    The ``reviews.parquet`` directory can be read as one dataset by pyarrow, pandas or DuckDB.
+    """
+
+    def __init__(self, company_code: str, row_group_size: int):
+        if pa is None:
+            raise RuntimeError("OUTPUT_FORMAT=parquet requires pyarrow to be installed.")
+        super().__init__(company_code)
+        dataset = os.path.join(self.folder, "reviews.parquet")
+        os.makedirs(dataset, exist_ok=True)
+        self.path = os.path.join(dataset, f"part-{time.time_ns()}-{os.getpid()}.parquet")
+        self.row_group_size = row_group_size
+        self.schema = pa.schema(
+            [(name, pa.int8()) for name in RATING_FIELDS]
+            + [(name, pa.string()) for name in TEXT_FIELDS]
+            + [("reasonResign", pa.string()), ("createdAt", pa.timestamp("ms", tz="UTC"))]
+        )
+        self._rows: List[Dict[str, Any]] = []
+        self._writer = None
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns: Dict[str, list] = {name: [r[name] for r in self._rows] for name in RATING_FIELDS + TEXT_FIELDS}
+        # reasonResign is untyped in Model; keep it as JSON text unless it already is a string.
+        columns["reasonResign"] = [
+            r["reasonResign"] if r["reasonResign"] is None or isinstance(r["reasonResign"], str)
+            else json.dumps(r["reasonResign"], ensure_ascii=False)
+            for r in self._rows
+        ]
+        columns["createdAt"] = pa.array([r["createdAt"] for r in self._rows]).cast(pa.timestamp("ms", tz="UTC"))
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+        self._writer.write_table(table)
+        self._rows = []
+
+    def _write_page(self, page, reviews):
+        self._rows.extend(reviews)
+        if len(self._rows) >= self.row_group_size:
+            self._flush()
+
+    def _close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def open_sink(company_code: str, output_format: Optional[str] = None) -> OutputSink:
+    output_format = output_format or settings.OUTPUT_FORMAT
+    if output_format == "auto":
+        # Parquet is both smaller and much faster to load; ndjson needs no extra dependency.
+        output_format = "parquet" if pa is not None else "ndjson"
+    if output_format == "ndjson":
+        return NDJSONSink(company_code, settings.OUTPUT_COMPRESSION)
+    if output_format == "parquet":
+        return ParquetSink(company_code, settings.PARQUET_ROW_GROUP_SIZE)
+    if output_format == "pages":
+        return PageFileSink(company_code)
+    if output_format == "none":
+        return OutputSink()
+    raise ValueError(f"Unknown OUTPUT_FORMAT {output_format!r}.")
+
+
+async def aopen_sink(company_code: str, output_format: Optional[str] = None) -> OutputSink:
+    """``open_sink`` on a worker thread; sinks create folders and open files when constructed."""
+    return await asyncio.to_thread(open_sink, company_code, output_format)
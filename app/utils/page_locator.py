@@ -0,0 +1,96 @@
+import time
+from contextlib import aclosing
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.core.config import settings, logger
+from app.utils.scraper import ReviewPage, iter_window_pages, probe_page
+
+# company_code -> page -> (newest, oldest, fetched_at); (None, None, t) marks a page past the end
+_page_ranges: Dict[str, Dict[int, Tuple[Optional[date], Optional[date], float]]] = {}
+
+
+def remember_page(company_code: str, page: int, date_range: Optional[Tuple[date, date]]):
+    newest, oldest = date_range or (None, None)
+    _page_ranges.setdefault(company_code, {})[page] = (newest, oldest, time.time())
+
+
+def _starts_at_or_before(oldest: Optional[date], start_date: date) -> bool:
+    # A page "reaches" start_date once its oldest review is not newer than it;
+    # an empty page (past the end) trivially does.
+    return oldest is None or oldest <= start_date
+
+
+def _cached_bounds(company_code: str, start_date: date) -> Tuple[int, Optional[int]]:
+    """Return (lo, hi): lo is a page known to end after start_date, hi one known to reach it.
+
+    New reviews only push older ones onto higher pages, so a page that ended
+    after start_date still does, whatever its age. The opposite is not true,
+    so only fresh entries are trusted as an upper bound.
+    """
+    lo, hi = 0, None
+    now = time.time()
+    for page, (_, oldest, fetched_at) in _page_ranges.get(company_code, {}).items():
+        if not _starts_at_or_before(oldest, start_date):
+            lo = max(lo, page)
+        elif now - fetched_at < settings.PAGE_LOCATOR_CACHE_TTL and (hi is None or page < hi):
+            hi = page
+    if hi is not None and hi <= lo:
+        hi = None
+    return lo, hi
+
+
+async def _probe(company_code: str, page: int, start_date: date, probed: Optional[Dict[int, Any]]) -> bool:
+    date_range, resp = await probe_page(company_code, page)
+    remember_page(company_code, page, date_range)
+    reached = _starts_at_or_before(date_range[1] if date_range else None, start_date)
+    if probed is not None and reached:
+        probed[page] = resp
+    return reached
+
+
+async def locate_start_page(company_code: str, start_date: date, probed: Optional[Dict[int, Any]] = None) -> int:
+    """Find the first page whose reviews reach back to ``start_date``.
+
+    Pages are ordered newest first, so "reaches start_date" is monotonic in the
+    page number: gallop forward from the last known page, then bisect. Responses
+    of probed pages at or after the start page are stored in ``probed`` so the
+    scrape that follows does not request them again.
+    """
+    if not settings.PAGE_LOCATOR_ENABLED or start_date >= date.today():
+        return 1
+
+    lo, hi = _cached_bounds(company_code, start_date)
+    probes = 0
+    if hi is None:
+        step = 1
+        while True:
+            page = lo + step
+            probes += 1
+            if await _probe(company_code, page, start_date, probed):
+                hi = page
+                break
+            lo = page
+            step *= 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        probes += 1
+        if await _probe(company_code, mid, start_date, probed):
+            hi = mid
+        else:
+            lo = mid
+
+    logger.info(f"Located start page {hi} for {company_code} at {start_date} after {probes} probe(s).")
+    return hi
+
+
+async def iter_located_pages(company_code: str, start_date: date, last_date: date) -> AsyncIterator[ReviewPage]:
+    """Like ``iter_window_pages`` but starts at the located page and feeds the page cache."""
+    probed: Dict[int, Any] = {}
+    start_page = await locate_start_page(company_code, start_date, probed)
+    pages = iter_window_pages(company_code, start_date, last_date, start_page=start_page, prefetched=probed)
+    async with aclosing(pages):
+        async for page in pages:
+            remember_page(company_code, page.page, page.date_range)
+            yield page
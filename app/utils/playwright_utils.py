@@ -7,11 +7,23 @@ from curl_cffi import requests
 import asyncio
 
 from app.core.config import settings, logger
+from app.utils.browser_pool import LAUNCH_ARGS, browser_pool
+from app.utils.http_pool import http_pool
+from app.utils.metrics import HTTP_REQUEST_SECONDS, HTTP_RETRIES, LOGINS, timed
+from app.utils.rate_limit import backoff_delay, get_host_limiter, parse_retry_after
+from app.utils.shared_state import INSTANCE_ID, SharedState, shared_state, write_json_atomic
 
 LOGIN_URL = "https://www.teamblind.com/sign-in"
 STATE_FILE = "auth_state.json"
+LOGIN_LOCK = "login"
+
+def session_expiry(cookies_data: list) -> Optional[float]:
+    for cookie in cookies_data:
+        if cookie["name"] == "bl_session_v2":
+            expires = cookie.get("expires", -1)
+            return None if expires == -1 else expires
+    return None
 
-_cookies: Optional[Dict[str, str]] = None
 
 def is_cookie_valid(cookies_data: list) -> bool:
     for cookie in cookies_data:
@@ -28,172 +40,368 @@ def is_cookie_valid(cookies_data: list) -> bool:
     logger.warning("bl_session_v2 not found in cookies.")
     return False
 
-async def fetch_cookies() -> Dict[str, str]:
-    global _cookies
-    if _cookies is not None:
-        logger.info("Reusing in-memory cookies.")
-        return _cookies
-
+def load_stored_cookies() -> Optional[list]:
     if os.path.exists(STATE_FILE):
         try:
             with open(STATE_FILE, "r") as f:
                 state = json.load(f)
             cookies_data = state.get("cookies", [])
             if is_cookie_valid(cookies_data):
-                _cookies = {c["name"]: c["value"] for c in cookies_data}
                 logger.info("Reusing valid cookies from auth_state.json.")
-                return _cookies
+                return cookies_data
             else:
                 logger.warning("Stored cookies are expired or invalid. Will log in again.")
         except Exception as e:
             logger.warning(f"Failed to read or parse auth_state.json: {e}")
+    return None
+
+def login_context_options() -> dict:
+    return dict(
+        user_agent=settings.User_Agent,
+        locale="en-US",
+        viewport={"width": 1280, "height": 800},
+        timezone_id="Asia/Dhaka", # Example timezone
+        extra_http_headers={
+            "sec-ch-ua": settings.User_Agent.split("Chrome/")[1].split(" ")[0].startswith("1") and f'"Chromium";v="{settings.User_Agent.split("Chrome/")[1].split(".")[0]}", "Not A;Brand";v="99"' or '" Not A;Brand";v="99", "Chromium";v="100"',
+            "sec-ch-ua-mobile": "?0",
+            "sec-ch-ua-platform": '"Linux"' # Example, can be Windows, macOS etc.
+        }
+    )
+
+async def login_in_context(context) -> list:
+    await context.add_init_script("""
+        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+        Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
+        Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3]});
+        Object.defineProperty(navigator, 'mimeTypes', {get: () => [1,2,3]});
+        """)
+
+    page = await context.new_page()
+    logger.info(f"Navigating to login page: {LOGIN_URL}")
+    await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+
+    logger.info("Filling login form.")
+    await page.fill("input[name=email]", settings.TEAMBLIND_USER_EMAIL)
+    await page.fill("input[name=password]", settings.TEAMBLIND_USER_PASS)
+    
+    submit_button_locator = page.locator("form").get_by_role("button", name="Sign in")
+    
+    count = await submit_button_locator.count()
+    if count == 1:
+        logger.info("Found unique 'Sign in' button. Clicking...")
+        await submit_button_locator.click()
+    elif count == 0:
+        logger.error("Login 'Sign in' button not found with the current locator.")
+        raise Exception("Login 'Sign in' button not found.")
+    else:
+        logger.error(f"Login 'Sign in' button locator is not unique. Matched {count} elements.")
+        raise Exception(f"Login 'Sign in' button locator is not unique, matched {count} elements.")
+
+    logger.info("Waiting for navigation after login submission...")
+    try:
+        await page.wait_for_url(
+            lambda url: "teamblind.com" in url and "sign-in" not in url and "check-email" not in url, 
+            timeout=30_000 # Reduced timeout slightly, adjust if needed
+        )
+        logger.info(f"Successfully navigated to: {page.url} after login attempt. Assuming login successful.")
+    except Exception as e:
+        logger.error(f"Timeout or error waiting for navigation after login: {e}. Current URL: {page.url}")
+        # Consider taking a screenshot here for debugging if this happens
+        # await page.screenshot(path="debug_login_nav_failure.png")
+        raise Exception(f"Failed to confirm navigation after login attempt: {e}")
+
+
+    # --- POST-LOGIN VERIFICATION REMOVED ---
+    # logger.info("Post-login verification step skipped as per configuration.")
+    # --- END OF REMOVAL ---
 
+    logger.info("Saving browser state (including cookies).")
+    state = await context.storage_state()
+    await asyncio.to_thread(write_json_atomic, STATE_FILE, state)
+
+    return await context.cookies()
+
+async def login() -> list:
+    """Log in with a headless browser, save the storage state and return the cookie list."""
     logger.info("Logging in to fetch new cookies.")
 
+    if browser_pool.running:
+        async with browser_pool.context(**login_context_options()) as context:
+            return await login_in_context(context)
+
     async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True, args=["--disable-blink-features=AutomationControlled"])
-        
-        context = await browser.new_context(
-            user_agent=settings.User_Agent,
-            locale="en-US",
-            viewport={"width": 1280, "height": 800},
-            timezone_id="Asia/Dhaka", # Example timezone
-            extra_http_headers={
-                "sec-ch-ua": settings.User_Agent.split("Chrome/")[1].split(" ")[0].startswith("1") and f'"Chromium";v="{settings.User_Agent.split("Chrome/")[1].split(".")[0]}", "Not A;Brand";v="99"' or '" Not A;Brand";v="99", "Chromium";v="100"',
-                "sec-ch-ua-mobile": "?0",
-                "sec-ch-ua-platform": '"Linux"' # Example, can be Windows, macOS etc.
-            }
-        )
+        browser = await pw.chromium.launch(headless=True, args=LAUNCH_ARGS)
+        try:
+            context = await browser.new_context(**login_context_options())
+            cookies_list = await login_in_context(context)
+            await context.close()
+            return cookies_list
+        finally:
+            await browser.close()
+            logger.info("Playwright browser closed.")
+
+
+class AuthenticationFailed(Exception):
+    """The server rejected a session right after it was issued, so logging in again would not help."""
+
+
+class CookieManager:
+    """Owns the session cookies shared by every request.
+
+    Logins are single-flight: concurrent callers that need a new session all
+    await the same login task. While a session is valid it is handed out
+    without waiting, and a background task logs in again shortly before
+    ``bl_session_v2`` expires so requests never block on a browser launch.
+
+    Across worker processes the session lives in the shared state: only the
+    holder of the login lock opens a browser, and everyone else adopts the
+    cookies it publishes.
+    """
+
+    def __init__(self, refresh_margin: int, state: Optional[SharedState] = None):
+        self.refresh_margin = refresh_margin
+        self.state = state or shared_state
+        self._cookies: Optional[Dict[str, str]] = None
+        self._expires_at: Optional[float] = None
+        self._issued_at = 0.0
+        self._rejected: Optional[Dict[str, str]] = None
+        self._from_login = False  # current session was issued by a login (ours or another worker's)
+        self._login_rejected_at = 0.0
+        self._lock = asyncio.Lock()
+        self._login_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _set(self, cookies_data: list):
+        self._cookies = {c["name"]: c["value"] for c in cookies_data}
+        self._expires_at = session_expiry(cookies_data)
+        self._issued_at = time.time()
+        self._from_login = False
 
-        await context.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-            Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
-            Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3]});
-            Object.defineProperty(navigator, 'mimeTypes', {get: () => [1,2,3]});
-            """)
-
-        page = await context.new_page()
-        logger.info(f"Navigating to login page: {LOGIN_URL}")
-        await page.goto(LOGIN_URL, wait_until="domcontentloaded")
-
-        logger.info("Filling login form.")
-        await page.fill("input[name=email]", settings.TEAMBLIND_USER_EMAIL)
-        await page.fill("input[name=password]", settings.TEAMBLIND_USER_PASS)
-        
-        submit_button_locator = page.locator("form").get_by_role("button", name="Sign in")
-        
-        count = await submit_button_locator.count()
-        if count == 1:
-            logger.info("Found unique 'Sign in' button. Clicking...")
-            await submit_button_locator.click()
-        elif count == 0:
-            logger.error("Login 'Sign in' button not found with the current locator.")
-            await browser.close() # Close browser before raising exception
-            raise Exception("Login 'Sign in' button not found.")
-        else:
-            logger.error(f"Login 'Sign in' button locator is not unique. Matched {count} elements.")
-            await browser.close() # Close browser before raising exception
-            raise Exception(f"Login 'Sign in' button locator is not unique, matched {count} elements.")
-
-        logger.info("Waiting for navigation after login submission...")
+    def _is_fresh(self) -> bool:
+        return self._cookies is not None and (self._expires_at is None or self._expires_at > time.time())
+
+    async def _adopt_shared(self) -> bool:
+        """Switch to the session in the shared state if it is valid, not rejected and newer than ours."""
         try:
-            await page.wait_for_url(
-                lambda url: "teamblind.com" in url and "sign-in" not in url and "check-email" not in url, 
-                timeout=30_000 # Reduced timeout slightly, adjust if needed
-            )
-            logger.info(f"Successfully navigated to: {page.url} after login attempt. Assuming login successful.")
+            cookies_data = await self.state.aget_cookies()
         except Exception as e:
-            logger.error(f"Timeout or error waiting for navigation after login: {e}. Current URL: {page.url}")
-            # Consider taking a screenshot here for debugging if this happens
-            # await page.screenshot(path="debug_login_nav_failure.png")
-            await browser.close()
-            raise Exception(f"Failed to confirm navigation after login attempt: {e}")
+            logger.warning(f"Failed to read shared cookies: {e}")
+            return False
+        if not cookies_data:
+            return False
+        expires = session_expiry(cookies_data)
+        if expires is None or expires <= time.time():
+            return False
+        if {c["name"]: c["value"] for c in cookies_data} == self._rejected:
+            return False
+        if self._cookies is not None and self._expires_at is not None and expires <= self._expires_at:
+            return False
+        self._set(cookies_data)
+        logger.info("Reusing cookies from the shared state.")
+        return True
+
+    async def _login(self):
+        # Wait for whichever worker holds the login lock and take its session, or log in ourselves.
+        while not await self.state.aclaim(LOGIN_LOCK, INSTANCE_ID, settings.LOGIN_LOCK_TTL):
+            if await self._adopt_shared():
+                self._from_login = True
+                return
+            await asyncio.sleep(1)
+        try:
+            if await self._adopt_shared():
+                self._from_login = True
+                return
+            try:
+                with timed("login"):
+                    cookies_data = await login()
+            except Exception:
+                LOGINS.labels("failure").inc()
+                raise
+            LOGINS.labels("success").inc()
+            self._set(cookies_data)
+            self._from_login = True
+            await self.state.aset_cookies(cookies_data)
+            logger.info("Fetched new cookies and published them to the shared state.")
+        finally:
+            await asyncio.shield(self.state.arelease(LOGIN_LOCK, INSTANCE_ID))
+
+    async def _login_once(self):
+        async with self._lock:
+            if self._login_task is None or self._login_task.done():
+                self._login_task = asyncio.create_task(self._login())
+            task = self._login_task
+        # Shielded so a cancelled caller does not abort the login the others wait on.
+        await asyncio.shield(task)
+
+    async def get(self) -> Dict[str, str]:
+        if self._is_fresh():
+            return self._cookies
+        async with self._lock:
+            if (
+                not self._is_fresh()
+                and (self._login_task is None or self._login_task.done())
+                and not await self._adopt_shared()
+            ):
+                cookies_data = load_stored_cookies()
+                # auth_state.json still holds the session that was just rejected.
+                if cookies_data is not None and {c["name"]: c["value"] for c in cookies_data} != self._rejected:
+                    self._set(cookies_data)
+        if not self._is_fresh():
+            if time.time() - self._login_rejected_at < settings.LOGIN_REJECTED_COOLDOWN:
+                raise AuthenticationFailed(
+                    "The server rejected a freshly issued session; not logging in again for "
+                    f"{settings.LOGIN_REJECTED_COOLDOWN}s."
+                )
+            await self._login_once()
+        return self._cookies
 
+    def invalidate(self, cookies: Optional[Dict[str, str]]):
+        """Drop ``cookies`` if they are still the current ones; a newer session is kept."""
+        if cookies is not None and cookies is self._cookies:
+            logger.info("Invalidating in-memory cookies.")
+            if self._from_login and time.time() - self._issued_at < settings.LOGIN_REJECTED_COOLDOWN:
+                logger.error("A freshly issued session was rejected; pausing logins.")
+                self._login_rejected_at = time.time()
+            self._rejected = self._cookies
+            self._cookies = None
+            self._expires_at = None
 
-        # --- POST-LOGIN VERIFICATION REMOVED ---
-        # logger.info("Post-login verification step skipped as per configuration.")
-        # --- END OF REMOVAL ---
+    async def _refresh_loop(self):
+        while True:
+            if self._expires_at is None:
+                await asyncio.sleep(self.refresh_margin)
+                continue
+            # Never refresh earlier than half-way through a session's lifetime.
+            margin = min(self.refresh_margin, (self._expires_at - self._issued_at) / 2)
+            delay = self._expires_at - margin - time.time()
+            if delay > 0:
+                await asyncio.sleep(min(delay, self.refresh_margin))
+                continue
+            logger.info("bl_session_v2 is about to expire. Refreshing cookies in the background.")
+            try:
+                await self._login_once()
+            except Exception as e:
+                logger.error(f"Background cookie refresh failed: {e}")
+                await asyncio.sleep(60)
 
-        logger.info("Saving browser state (including cookies).")
-        await context.storage_state(path=STATE_FILE)
+    async def start(self):
+        if not await self._adopt_shared():
+            cookies_data = load_stored_cookies()
+            if cookies_data is not None:
+                self._set(cookies_data)
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
 
-        cookies_list = await context.cookies()
-        _cookies = {c["name"]: c["value"] for c in cookies_list}
-        logger.info("Fetched and stored new cookies in memory.")
 
-        await context.close()
-        await browser.close()
-        logger.info("Playwright browser closed.")
+cookie_manager = CookieManager(settings.COOKIE_REFRESH_MARGIN)
 
-        return _cookies
+
+async def fetch_cookies() -> Dict[str, str]:
+    return await cookie_manager.get()
 
 # ---- UNIVERSAL FAILSAFE REQUEST WRAPPER ----
-# (robust_request function remains the same as the previous full version)
-async def robust_request(url: str, method="get", max_retries=10, **kwargs):
-    global _cookies
+class RetryBudgetExceeded(Exception):
+    pass
+
+async def robust_request(url: str, method="get", max_retries=None, deadline=None, **kwargs):
+    """Send a request with the shared session cookies, retrying transient failures.
+
+    Requests wait on the host's adaptive rate limiter. 429 and 5xx responses
+    slow that limiter down (honouring Retry-After), every retry waits with
+    jittered exponential backoff, and the whole call gives up once
+    ``max_retries`` or the ``deadline`` (seconds) is exhausted. Cookies are
+    only dropped when the server rejects them with 401/403; if the session a
+    re-login produced is rejected as well, AuthenticationFailed is raised
+    instead of logging in again.
+    """
+    max_retries = settings.REQUEST_MAX_RETRIES if max_retries is None else max_retries
+    deadline_at = time.monotonic() + (settings.REQUEST_DEADLINE if deadline is None else deadline)
+    limiter = get_host_limiter(url)
     attempt = 0
     last_exception = None
 
-    while attempt <= max_retries:
-        current_cookies = _cookies 
-        if current_cookies is None: 
-            logger.info(f"No in-memory cookies for {url}, fetching new ones (Attempt {attempt + 1}).")
+    while True:
+        delay = None
+        reason = "cookies"
+        try:
+            with timed("cookies"):
+                current_cookies = await cookie_manager.get()
+        except AuthenticationFailed:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to fetch cookies during robust_request: {e}")
+            last_exception = e
+            current_cookies = None
+
+        if current_cookies is not None:
             try:
-                current_cookies = await fetch_cookies()
-            except Exception as e:
-                logger.error(f"Failed to fetch cookies during robust_request: {e}")
-                attempt += 1 
-                last_exception = e
-                if attempt > max_retries:
-                    raise Exception(f"Failed to fetch cookies after {max_retries + 1} attempts. Last error: {last_exception}") from last_exception
-                await asyncio.sleep(attempt * 2) 
-                continue 
+                logger.debug(f"Attempt {attempt + 1}/{max_retries + 1} to {method.upper()} {url}")
+                await limiter.acquire()
+                timeout = max(min(20, deadline_at - time.monotonic()), 1)
+                started = time.perf_counter()
+                status = "error"
+                try:
+                    with timed("http_fetch"):
+                        async with http_pool.session(url) as async_session:
+                            if method.lower() == "get":
+                                resp = await async_session.get(url, cookies=current_cookies, timeout=timeout, **kwargs)
+                            elif method.lower() == "post":
+                                resp = await async_session.post(url, cookies=current_cookies, timeout=timeout, **kwargs)
+                            else:
+                                raise ValueError(f"Unsupported HTTP method: {method}")
+                    status = str(resp.status_code)
+                finally:
+                    HTTP_REQUEST_SECONDS.labels(status).observe(time.perf_counter() - started)
+                http_pool.record(resp)
+                logger.debug(f"Response status for {url}: {resp.status_code}")
 
-        try:
-            logger.debug(f"Attempt {attempt + 1}/{max_retries + 1} to {method.upper()} {url}")
-            async with requests.AsyncSession() as async_session: 
-                if method.lower() == "get":
-                    resp = await async_session.get(url, cookies=current_cookies, timeout=20, **kwargs)
-                elif method.lower() == "post":
-                    resp = await async_session.post(url, cookies=current_cookies, timeout=20, **kwargs)
+                if resp.status_code in (401, 403):
+                    logger.warning(f"Auth failed (status {resp.status_code}) for {url}. Invalidating cookies and retrying...")
+                    cookie_manager.invalidate(current_cookies)
+                    last_exception = requests.RequestsError(f"HTTP {resp.status_code}", response=resp)
+                    reason = "auth"
+                elif resp.status_code == 429 or resp.status_code >= 500:
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    limiter.on_throttle(retry_after)
+                    logger.warning(f"HTTP {resp.status_code} for {url} (Attempt {attempt + 1}). Backing off.")
+                    last_exception = requests.RequestsError(f"HTTP {resp.status_code}", response=resp)
+                    reason = "throttled" if resp.status_code == 429 else "server_error"
+                    delay = max(retry_after or 0, backoff_delay(attempt + 1))
                 else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            logger.debug(f"Response status for {url}: {resp.status_code}")
-
-            if resp.status_code in (401, 403):
-                logger.warning(f"Auth failed (status {resp.status_code}) for {url}. Invalidating cookies and retrying...")
-                _cookies = None 
-                attempt += 1
-                last_exception = requests.RequestsError(f"HTTP {resp.status_code}") 
-                await asyncio.sleep(1 + attempt) 
-                continue
-            
-            resp.raise_for_status() 
-            return resp
-        
-        except requests.RequestsError as ex: 
-            logger.error(f"Request error for {url} (Attempt {attempt + 1}): {ex}. Status: {getattr(ex, 'response', None) and getattr(ex.response, 'status_code', 'N/A')}")
-            last_exception = ex
-            if hasattr(ex, 'response') and ex.response is not None and 400 <= ex.response.status_code < 500 and ex.response.status_code not in (401, 403, 429):
-                logger.warning(f"Client error {ex.response.status_code} for {url}. Not clearing cookies, but failing fast.")
-                raise 
-            
-            _cookies = None 
-            attempt += 1
-            if attempt > max_retries:
-                logger.error(f"Failed to fetch {url} after {max_retries+1} attempts due to RequestsError.")
-                raise last_exception from last_exception
-            await asyncio.sleep(attempt * 2) 
-            
-        except Exception as ex:
-            logger.error(f"Generic error during request for {url} (Attempt {attempt + 1}): {ex}")
-            last_exception = ex
-            _cookies = None 
-            attempt += 1
-            if attempt > max_retries:
-                logger.error(f"Failed to fetch {url} after {max_retries+1} attempts due to generic error.")
-                raise last_exception from last_exception
-            await asyncio.sleep(attempt * 2) 
-
-    raise Exception(f"Failed to fetch {url} after {max_retries+1} attempts. Last error: {last_exception}") from last_exception
\ No newline at end of file
+                    resp.raise_for_status()
+                    limiter.on_success()
+                    return resp
+
+            except requests.RequestsError as ex:
+                response = getattr(ex, "response", None)
+                if response is not None and 400 <= response.status_code < 500:
+                    logger.warning(f"Client error {response.status_code} for {url}. Failing fast.")
+                    raise
+                logger.error(f"Request error for {url} (Attempt {attempt + 1}): {ex}")
+                last_exception = ex
+                reason = "network"
+
+            except ValueError:
+                raise
+
+            except Exception as ex:
+                logger.error(f"Generic error during request for {url} (Attempt {attempt + 1}): {ex}")
+                last_exception = ex
+                reason = "error"
+
+        attempt += 1
+        if delay is None:
+            delay = backoff_delay(attempt)
+        if attempt > max_retries or time.monotonic() + delay > deadline_at:
+            logger.error(f"Failed to fetch {url} after {attempt} attempt(s).")
+            raise RetryBudgetExceeded(f"Failed to fetch {url} after {attempt} attempt(s). Last error: {last_exception}") from last_exception
+        HTTP_RETRIES.labels(reason).inc()
+        await asyncio.sleep(delay)
@@ -0,0 +1,152 @@
+import asyncio
+import random
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from app.core.config import settings, logger
+
+
+class RateLimiter:
+    """Token bucket shared by every request to one host."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Token bucket whose rate follows the server: AIMD on 429/5xx, paused for Retry-After.
+
+    Every success adds ``increase`` requests/second up to ``max_rate``; every
+    throttling response halves the rate down to ``min_rate``. A ``max_rate``
+    of 0 means unlimited until the server first pushes back; the first
+    halving then starts from the rate last measured over RATE_WINDOW seconds
+    of traffic, or from ``initial_rate`` if there never was enough of it.
+    """
+
+    RATE_WINDOW = 2.0  # seconds of acquires used to measure the rate actually sent
+    MIN_RATE_SAMPLES = 4
+
+    def __init__(self, max_rate: float, min_rate: float, increase: float, initial_rate: float):
+        super().__init__(max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.initial_rate = initial_rate
+        self.successes = 0
+        self.throttles = 0
+        self._paused_until = 0.0
+        self._recent = deque()  # acquire times within RATE_WINDOW
+        self._measured = 0.0
+
+    async def acquire(self):
+        delay = self._paused_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._paused_until - time.monotonic()
+        await super().acquire()
+        now = time.monotonic()
+        self._recent.append(now)
+        while self._recent[0] < now - self.RATE_WINDOW:
+            self._recent.popleft()
+        span = now - self._recent[0]
+        if len(self._recent) >= self.MIN_RATE_SAMPLES and span > 0:
+            # Measured between the acquires themselves, so a later idle gap does not dilute it.
+            self._measured = (len(self._recent) - 1) / span
+
+    def measured_rate(self) -> float:
+        """Send rate of the last busy RATE_WINDOW, or ``initial_rate`` before there was one."""
+        return self._measured or self.initial_rate
+
+    def on_success(self):
+        self.successes += 1
+        if self.rate <= 0:
+            return
+        if self.max_rate <= 0 or self.rate + self.increase < self.max_rate:
+            self.rate += self.increase
+        else:
+            self.rate = self.max_rate
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        self.throttles += 1
+        self._refill()
+        # An unlimited host has no configured rate to halve; halve what it was actually sent.
+        current = self.rate if self.rate > 0 else self.measured_rate()
+        self.rate = max(self.min_rate, current / 2)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logger.warning(f"Throttled by server; request rate lowered to {self.rate:.2f}/s.")
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "rate": round(self.rate, 3),
+            "max_rate": self.max_rate,
+            "successes": self.successes,
+            "throttles": self.throttles,
+            "paused_for": round(max(self._paused_until - time.monotonic(), 0.0), 3),
+        }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (1-based) retry attempt."""
+    ceiling = min(settings.RETRY_BACKOFF_MAX, settings.RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+
+
+def get_host_limiter(url: str) -> AdaptiveRateLimiter:
+    host = urlsplit(url).netloc
+    limiter = _limiters.get(host)
+    if limiter is None:
+        limiter = AdaptiveRateLimiter(
+            settings.HOST_REQUESTS_PER_SECOND,
+            settings.HOST_MIN_REQUESTS_PER_SECOND,
+            settings.HOST_RATE_INCREASE,
+            settings.HOST_INITIAL_REQUESTS_PER_SECOND,
+        )
+        _limiters[host] = limiter
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, object]]:
+    return {host: limiter.stats() for host, limiter in _limiters.items()}
@@ -0,0 +1,63 @@
+import time
+from contextlib import aclosing
+from datetime import date
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional
+
+from app.core.config import settings, logger
+from app.utils.metrics import timed
+from app.utils.page_locator import iter_located_pages
+from app.utils.playwright_utils import fetch_cookies
+from app.utils.review_store import review_store
+
+
+class ReviewBatch(NamedTuple):
+    overall_review: Dict[str, Any]
+    reviews: List[Dict[str, Any]]
+    page: Optional[int]  # scraped page number, None when served from the review store
+    page_size: int  # reviews on the scraped page before date filtering
+
+
+async def iter_reviews(company_code: str, start_date: date, last_date: date) -> AsyncIterator[ReviewBatch]:
+    """Yield the reviews of a window newest first, one batch per scraped page or store chunk.
+
+    Covered parts of the window come from the review store, the rest is
+    scraped page by page, so at most one page fetch window is held in memory.
+    """
+    if settings.REVIEW_STORE_ENABLED:
+        segments = await review_store.aplan_windows(company_code, start_date, last_date)
+    else:
+        segments = [(start_date, last_date, False)]
+
+    if any(not covered for _, _, covered in segments):
+        await fetch_cookies()
+        logger.info(f"Cookies collected and Started scraping {company_code}")
+    else:
+        logger.info(f"Serving {company_code} {last_date}..{start_date} from the review store.")
+
+    overall_review = None
+    for segment_start, segment_last, covered in segments:
+        if covered:
+            if overall_review is None:
+                overall_review = await review_store.aget_overall(company_code)
+            after = None
+            while True:
+                with timed("store_read"):
+                    reviews, after = await review_store.aquery_batch(
+                        company_code, segment_start, segment_last, after, settings.REVIEW_STORE_BATCH_SIZE
+                    )
+                yield ReviewBatch(overall_review, reviews, None, len(reviews))
+                if after is None:
+                    break
+            continue
+
+        fetched_at = time.time()
+        pages = iter_located_pages(company_code, segment_start, segment_last)
+        async with aclosing(pages):
+            async for page in pages:
+                overall_review = page.overall_review
+                if settings.REVIEW_STORE_ENABLED:
+                    with timed("store_write"):
+                        await review_store.aadd_page(company_code, overall_review, page.reviews)
+                yield ReviewBatch(overall_review, page.reviews, page.page, page.page_size)
+        if settings.REVIEW_STORE_ENABLED:
+            await review_store.aadd_coverage(company_code, segment_start, segment_last, fetched_at)
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+RATING_FIELDS = ("overall", "career", "balance", "compensation", "culture", "management")
+
+
+@lru_cache(maxsize=4096)
+def bucket_start(day: str, bucket: str) -> date:
+    """First day of the ``bucket`` (day/week/month/quarter/year) containing the ISO ``day``."""
+    value = date.fromisoformat(day)
+    if bucket == "day":
+        return value
+    if bucket == "week":
+        return value - timedelta(days=value.weekday())
+    if bucket == "month":
+        return value.replace(day=1)
+    if bucket == "quarter":
+        return date(value.year, (value.month - 1) // 3 * 3 + 1, 1)
+    if bucket == "year":
+        return date(value.year, 1, 1)
+    raise ValueError(f"Unknown bucket {bucket!r}")
+
+
+class RatingCounts:
+    """Per-field histogram of rating values; means are derived from it on output."""
+
+    __slots__ = ("count", "values")
+
+    def __init__(self):
+        self.count = 0
+        self.values = {field: defaultdict(int) for field in RATING_FIELDS}
+
+    def add(self, review: Dict[str, Any]):
+        self.count += 1
+        for field in RATING_FIELDS:
+            value = review.get(field)
+            if value is not None:
+                self.values[field][value] += 1
+
+    def merge(self, other: "RatingCounts"):
+        self.count += other.count
+        for field, counts in other.values.items():
+            for value, n in counts.items():
+                self.values[field][value] += n
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        fields = {}
+        for field, counts in self.values.items():
+            n = sum(counts.values())
+            fields[field] = {
+                "count": n,
+                "mean": round(sum(value * c for value, c in counts.items()) / n, 4) if n else None,
+                "distribution": dict(sorted(counts.items())),
+            }
+        return fields
+
+
+class ReviewStats:
+    """Aggregates rating statistics per date bucket as review batches arrive.
+
+    Only the rating histograms are kept, so memory depends on the number of
+    buckets and not on how many reviews the window holds.
+    """
+
+    def __init__(self, bucket: str = "month"):
+        self.bucket = bucket
+        self.buckets: Dict[date, RatingCounts] = {}
+
+    def add(self, reviews: Iterable[Dict[str, Any]]):
+        for review in reviews:
+            start = bucket_start(review["createdAt"][:10], self.bucket)
+            counts = self.buckets.get(start)
+            if counts is None:
+                counts = self.buckets[start] = RatingCounts()
+            counts.add(review)
+
+    def totals(self) -> RatingCounts:
+        total = RatingCounts()
+        for counts in self.buckets.values():
+            total.merge(counts)
+        return total
+
+    def bucket_summaries(self) -> List[Dict[str, Any]]:
+        return [
+            {"start": start, "count": counts.count, "fields": counts.summary()}
+            for start, counts in sorted(self.buckets.items())
+        ]
@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings, logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    company TEXT NOT NULL,
+    review_key TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    created_date TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (company, review_key)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_company_date ON reviews (company, created_date);
+CREATE TABLE IF NOT EXISTS companies (
+    company TEXT PRIMARY KEY,
+    overall TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    company TEXT NOT NULL,
+    from_date TEXT NOT NULL,
+    to_date TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_coverage_company ON coverage (company);
+"""
+
+
+def review_key(review: Dict[str, Any]) -> str:
+    """Identity of a review: its createdAt plus a hash of its text."""
+    digest = hashlib.sha1(
+        "\x1f".join(str(review.get(k) or "") for k in ("summary", "pros", "cons")).encode("utf-8")
+    ).hexdigest()[:16]
+    return f"{review['createdAt']}:{digest}"
+
+
+class ReviewStore:
+    """SQLite (WAL) store of scraped reviews and of the date ranges already covered per company.
+
+    Calls are blocking and serialised on one connection; use the ``a*`` coroutines
+    from the event loop, they run on a worker thread.
+    """
+
+    def __init__(self, path: str, freshness: int):
+        self.path = path
+        self.freshness = freshness
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            logger.info(f"Opened review store at {self.path}.")
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                logger.info("Review store closed.")
+
+    # ---- coverage ----
+
+    def _effective_coverage(self, company: str) -> List[Tuple[date, date]]:
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT from_date, to_date, fetched_at FROM coverage WHERE company = ?", (company,)
+            ).fetchall()
+        intervals = []
+        for from_date, to_date, fetched_at in rows:
+            start, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+            # Nothing newer than the fetch can be known, and the fetch day itself
+            # keeps receiving reviews, so it only counts while the fetch is fresh.
+            fetched_day = datetime.fromtimestamp(fetched_at, timezone.utc).date()
+            if end >= fetched_day:
+                end = fetched_day if now - fetched_at < self.freshness else fetched_day - timedelta(days=1)
+            if start <= end:
+                intervals.append((start, end))
+        return sorted(intervals)
+
+    def plan_windows(self, company: str, start_date: date, last_date: date) -> List[Tuple[date, date, bool]]:
+        """Split a window into (start_date, last_date, covered) segments, newest first."""
+        segments = []
+        cursor = last_date
+        for start, end in self._effective_coverage(company):
+            if end < cursor:
+                continue
+            if start > start_date:
+                break
+            if start > cursor:
+                segments.append((start - timedelta(days=1), cursor, False))
+            covered_to = min(end, start_date)
+            segments.append((covered_to, max(start, cursor), True))
+            cursor = covered_to + timedelta(days=1)
+            if cursor > start_date:
+                break
+        if cursor <= start_date:
+            segments.append((start_date, cursor, False))
+        return list(reversed(segments))
+
+    def missing_windows(self, company: str, start_date: date, last_date: date) -> List[Tuple[date, date]]:
+        """Return the (start_date, last_date) sub-windows not covered yet, newest first."""
+        return [(start, last) for start, last, covered in self.plan_windows(company, start_date, last_date) if not covered]
+
+    def add_coverage(self, company: str, start_date: date, last_date: date, fetched_at: float):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO coverage (company, from_date, to_date, fetched_at) VALUES (?, ?, ?, ?)",
+                    (company, last_date.isoformat(), start_date.isoformat(), fetched_at),
+                )
+
+    # ---- reviews ----
+
+    def add_page(self, company: str, overall_review: Dict[str, Any], reviews: List[Dict[str, Any]]):
+        rows = [
+            (company, review_key(r), r["createdAt"], r["createdAt"][:10], json.dumps(r, ensure_ascii=False))
+            for r in reviews
+        ]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO companies (company, overall, updated_at) VALUES (?, ?, ?)",
+                    (company, json.dumps(overall_review, ensure_ascii=False), time.time()),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO reviews (company, review_key, created_at, created_date, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+    def get_overall(self, company: str) -> Dict[str, Any]:
+        with self._lock:
+            row = self._connect().execute("SELECT overall FROM companies WHERE company = ?", (company,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def query_batch(
+        self,
+        company: str,
+        start_date: date,
+        last_date: date,
+        after: Optional[Tuple[str, str]] = None,
+        limit: int = 500,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """Return up to ``limit`` reviews newest first, continuing after the ``after`` cursor.
+
+        The returned cursor is None once the window is exhausted.
+        """
+        sql = "SELECT data, created_at, review_key FROM reviews WHERE company = ? AND created_date BETWEEN ? AND ?"
+        params: List[Any] = [company, last_date.isoformat(), start_date.isoformat()]
+        if after is not None:
+            sql += " AND (created_at < ? OR (created_at = ? AND review_key < ?))"
+            params += [after[0], after[0], after[1]]
+        sql += " ORDER BY created_at DESC, review_key DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        cursor = (rows[-1][1], rows[-1][2]) if len(rows) == limit else None
+        return [json.loads(row[0]) for row in rows], cursor
+
+    # ---- async wrappers ----
+
+    async def aplan_windows(self, company: str, start_date: date, last_date: date):
+        return await asyncio.to_thread(self.plan_windows, company, start_date, last_date)
+
+    async def amissing_windows(self, company: str, start_date: date, last_date: date):
+        return await asyncio.to_thread(self.missing_windows, company, start_date, last_date)
+
+    async def aadd_coverage(self, company: str, start_date: date, last_date: date, fetched_at: float):
+        await asyncio.to_thread(self.add_coverage, company, start_date, last_date, fetched_at)
+
+    async def aadd_page(self, company: str, overall_review: Dict[str, Any], reviews: List[Dict[str, Any]]):
+        await asyncio.to_thread(self.add_page, company, overall_review, reviews)
+
+    async def aget_overall(self, company: str):
+        return await asyncio.to_thread(self.get_overall, company)
+
+    async def aquery_batch(self, company: str, start_date: date, last_date: date, after=None, limit: int = 500):
+        return await asyncio.to_thread(self.query_batch, company, start_date, last_date, after, limit)
+
+review_store = ReviewStore(settings.REVIEW_STORE_PATH, settings.REVIEW_STORE_FRESHNESS)
@@ -0,0 +1,127 @@
+"""Minimal reader for the Next.js React Server Components ("flight") payload.
+
+A flight response is a sequence of rows ``<hex id>:<payload>``. Most rows are
+one JSON value terminated by a newline; text rows are written as
+``<id>:T<hex byte length>,<text>`` and may contain newlines themselves. Rows
+are located by walking the buffer, without splitting it into lines, and only
+the rows that are actually needed get decoded.
+"""
+import json
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+try:
+    import orjson
+
+    def loads(data: Union[bytes, memoryview]) -> Any:
+        return orjson.loads(data)
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+    def loads(data: Union[bytes, memoryview]) -> Any:
+        return json.loads(bytes(data))
+
+
+class RSCFormatError(Exception):
+    """The payload does not have the layout the scraper expects."""
+
+
+def _iter_rows(buf: bytes) -> Iterator[Tuple[str, int, int]]:
+    """Yield ``(row_id, start, end)`` for every row; ``buf[start:end]`` is its payload."""
+    pos, size = 0, len(buf)
+    while pos < size:
+        if buf[pos] in b"\r\n \t":
+            pos += 1
+            continue
+        colon = buf.find(b":", pos)
+        if colon == -1:
+            return
+        row_id = buf[pos:colon].decode("ascii", "replace").strip()
+        start = colon + 1
+        if buf.startswith(b"T", start):
+            comma = buf.find(b",", start)
+            try:
+                length = int(buf[start + 1:comma], 16)
+            except ValueError:
+                raise RSCFormatError(f"Malformed text row {row_id!r} at offset {pos}.")
+            end = comma + 1 + length
+            yield row_id, comma + 1, end
+            pos = end
+            continue
+        end = buf.find(b"\n", start)
+        if end == -1:
+            end = size
+        yield row_id, start, end
+        pos = end + 1
+
+
+def find_row(buf: bytes, row_id: str) -> Optional[memoryview]:
+    """Return the payload of the first row with ``row_id``, stopping as soon as it is found."""
+    for rid, start, end in _iter_rows(buf):
+        if rid == row_id:
+            return memoryview(buf)[start:end]
+    return None
+
+
+class FlightPayload:
+    """Lazily decoded view over all rows of a flight response, indexed by id."""
+
+    def __init__(self, buf: Union[bytes, str]):
+        if isinstance(buf, str):
+            buf = buf.encode("utf-8")
+        self._buf = buf
+        self._index: Optional[Dict[str, Tuple[int, int]]] = None
+        self._decoded: Dict[str, Any] = {}
+
+    @property
+    def index(self) -> Dict[str, Tuple[int, int]]:
+        if self._index is None:
+            index = {}
+            for rid, start, end in _iter_rows(self._buf):
+                index.setdefault(rid, (start, end))
+            self._index = index
+        return self._index
+
+    def row(self, row_id: str) -> Any:
+        if row_id in self._decoded:
+            return self._decoded[row_id]
+        if self._index is None:
+            view = find_row(self._buf, row_id)
+        else:
+            span = self._index.get(row_id)
+            view = memoryview(self._buf)[span[0]:span[1]] if span else None
+        if view is None:
+            raise RSCFormatError(f"Row {row_id!r} not found; rows present: {sorted(self.index)}.")
+        try:
+            value = loads(view)
+        except ValueError as e:
+            raise RSCFormatError(f"Row {row_id!r} is not valid JSON: {e}")
+        self._decoded[row_id] = value
+        return value
+
+    def _resolve(self, node: Any) -> Any:
+        # "$L<id>" (lazy component) and "$<id>" (model reference) point at other rows.
+        if isinstance(node, str) and node.startswith("$") and len(node) > 1:
+            ref = node[2:] if node.startswith("$L") else node[1:]
+            if ref and all(c in "0123456789abcdef" for c in ref) and ref in self.index:
+                return self.row(ref)
+        return node
+
+    def get(self, row_id: str, path: Sequence[Union[int, str]]) -> Any:
+        """Walk ``path`` from the root of a row, following row references on the way.
+
+        Raises RSCFormatError naming the first step that does not match.
+        """
+        node = self.row(row_id)
+        walked = f"row {row_id}"
+        for step in path:
+            node = self._resolve(node)
+            try:
+                node = node[step]
+            except (KeyError, IndexError, TypeError):
+                kind = type(node).__name__
+                detail = f"keys {sorted(node)[:10]}" if isinstance(node, dict) else (
+                    f"length {len(node)}" if isinstance(node, list) else repr(node)[:40]
+                )
+                raise RSCFormatError(f"Cannot take {step!r} of {walked}: got {kind} with {detail}.")
+            walked += f"[{step!r}]"
+        return self._resolve(node)
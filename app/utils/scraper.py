@@ -0,0 +1,152 @@
+import asyncio
+from contextlib import aclosing
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple, Union
+from fastapi import HTTPException
+
+from app.core.config import settings, logger
+from app.schema.review_model import ReviewList
+from app.utils.metrics import PAGES, timed
+from app.utils.playwright_utils import robust_request
+from app.utils.rsc import FlightPayload, RSCFormatError
+
+
+class ReviewPage(NamedTuple):
+    page: int
+    overall_review: Dict[str, Any]
+    reviews: List[Dict[str, Any]]  # validated reviews inside the requested window
+    page_size: int  # number of reviews on the page before date filtering
+    date_range: Optional[Tuple[date, date]]  # (newest, oldest) createdAt on the page
+    reached_cutoff: bool
+
+
+def reviews_url(company_code: str, page: int) -> str:
+    return f"{settings.TEAMBLIND_BASE_URL}/company/{company_code}/reviews?page={page}"
+
+
+def request_headers() -> Dict[str, str]:
+    return {
+        "User-Agent": settings.User_Agent,
+        "next-router-state-tree": settings.next_router_state_tree,
+        "rsc": settings.rsc,
+    }
+
+
+OVERALL_REVIEW_PATH = (0, 3, "children", 0, 3)
+REVIEWS_LIST_PATH = (0, 3, "children", 1, 3, "children", 3, "reviews", "list")
+
+
+def parse_review_page(raw_output: Union[bytes, str], page: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    payload = FlightPayload(raw_output)
+    try:
+        with timed("rsc_parse"):
+            overall_review = payload.get("2", OVERALL_REVIEW_PATH)
+            reviews = payload.get("2", REVIEWS_LIST_PATH)
+    except RSCFormatError as e:
+        logger.error(f"Unexpected review payload on page {page}: {e}")
+        raise HTTPException(status_code=502, detail=f"Unexpected review payload on page {page}: {e}")
+    return overall_review, reviews
+
+
+def parse_created_at(value: str) -> date:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+
+
+def select_window(reviews: List[Dict[str, Any]], start_date: date, last_date: date) -> List[Dict[str, Any]]:
+    """Validate a page of reviews and keep those created within ``[last_date, start_date]``.
+
+    createdAt is ISO 8601, so its first ten characters are the calendar date and
+    compare as strings without building a datetime per review.
+    """
+    first, last = start_date.isoformat(), last_date.isoformat()
+    return [review for review in ReviewList.validate_python(reviews) if last <= review["createdAt"][:10] <= first]
+
+
+async def probe_page(company_code: str, page: int) -> Tuple[Optional[Tuple[date, date]], Any]:
+    """Fetch a single page and return its (newest, oldest) createdAt, or None past the last page, with the response."""
+    url = reviews_url(company_code, page)
+    logger.info(f"Probing {url}")
+    resp = await robust_request(url, headers=request_headers())
+    if not (resp and resp.content):
+        raise HTTPException(status_code=502, detail=f"Failed to retrieve content or content is empty for page {page}.")
+    _, reviews = parse_review_page(resp.content, page)
+    if not reviews:
+        return None, resp
+    return (parse_created_at(reviews[0]["createdAt"]), parse_created_at(reviews[-1]["createdAt"])), resp
+
+
+async def fetch_pages(
+    company_code: str,
+    start_page: int = 1,
+    window: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    prefetched: Optional[Dict[int, Any]] = None,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield ``(page, response)`` in page order, keeping ``window`` pages in flight.
+
+    Pages still in flight when the consumer stops iterating are cancelled.
+    With ``max_pages`` nothing past ``start_page + max_pages - 1`` is requested.
+    Responses in ``prefetched`` (page -> response) are used instead of fetching.
+    """
+    prefetched = prefetched or {}
+    window = max(window or settings.PAGE_FETCH_WINDOW, 1)
+    end_page = start_page + max_pages if max_pages else None
+    headers = request_headers()
+    pending: Dict[int, asyncio.Future] = {}
+    next_page = start_page
+    try:
+        while True:
+            while len(pending) < window and (end_page is None or next_page < end_page):
+                if next_page in prefetched:
+                    pending[next_page] = asyncio.get_running_loop().create_future()
+                    pending[next_page].set_result(prefetched[next_page])
+                else:
+                    url = reviews_url(company_code, next_page)
+                    logger.info(f"Fetching {url}")
+                    pending[next_page] = asyncio.create_task(robust_request(url, headers=headers))
+                next_page += 1
+            if not pending:
+                return
+            page = min(pending)
+            resp = await pending.pop(page)
+            yield page, resp
+    finally:
+        for task in pending.values():
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+            logger.info(f"Cancelled {len(pending)} in-flight page(s) for {company_code}.")
+
+
+async def iter_window_pages(
+    company_code: str,
+    start_date: date,
+    last_date: date,
+    start_page: int = 1,
+    window: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    prefetched: Optional[Dict[int, Any]] = None,
+) -> AsyncIterator[ReviewPage]:
+    """Yield parsed pages, newest first, until the ``last_date`` cutoff is reached."""
+    async with aclosing(fetch_pages(company_code, start_page, window, max_pages, prefetched)) as pages:
+        async for page, resp in pages:
+            if not (resp and resp.content):
+                logger.error(f"Failed to retrieve content or content is empty for page {page}.")
+                raise HTTPException(status_code=502, detail=f"Failed to retrieve content or content is empty for page {page}.")
+
+            overall_review, reviews = parse_review_page(resp.content, page)
+            PAGES.inc()
+            if not reviews:
+                logger.info(f"No reviews found on page {page}.")
+                yield ReviewPage(page, overall_review, [], 0, None, True)
+                return
+
+            with timed("validation"):
+                page_reviews = select_window(reviews, start_date, last_date)
+
+            # Check last review's createdAt for stopping condition
+            date_range = (parse_created_at(reviews[0]["createdAt"]), parse_created_at(reviews[-1]["createdAt"]))
+            reached_cutoff = date_range[1] < last_date
+            yield ReviewPage(page, overall_review, page_reviews, len(reviews), date_range, reached_cutoff)
+            if reached_cutoff:
+                return
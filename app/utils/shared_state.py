@@ -0,0 +1,265 @@
+"""State shared by every worker process of the service.
+
+Running uvicorn with ``--workers N`` or several containers means each process
+has its own memory, so anything that must be done once across the deployment
+goes through a shared backend selected by SHARED_STATE_BACKEND:
+
+- ``file``: a JSON file guarded by an ``flock`` lock file, for workers on one host
+  (or containers sharing a volume)
+- ``redis``: any Redis-compatible server at SHARED_STATE_URL, for several hosts
+- ``memory``: process-local, only correct with a single worker
+
+It holds the session cookies and named leases with an owner and a TTL. A
+lease is used as the login lock and to give one worker at a time a range of
+pages to scrape; a worker that dies simply lets its leases expire.
+"""
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from app.core.config import settings, logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is optional
+    redis = None
+
+# Identifies this process as a lease owner; callers append their own suffix for finer-grained owners.
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive ``flock`` on ``path`` for the duration of the block.
+
+    Every open() gets its own lock, so this excludes other threads of the same
+    process as well as other processes.
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_json_atomic(path: str, data: Any):
+    """Replace ``path`` in one step so readers never see a half-written file."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+class SharedState:
+    """Base backend; subclasses implement the blocking methods, the ``a*`` wrappers run them off the event loop."""
+
+    def get_cookies(self) -> Optional[list]:
+        raise NotImplementedError
+
+    def set_cookies(self, cookies_data: list):
+        raise NotImplementedError
+
+    def claim(self, key: str, owner: str, ttl: float) -> bool:
+        """Take lease ``key`` for ``ttl`` seconds unless another owner holds it; re-claiming your own lease extends it."""
+        raise NotImplementedError
+
+    def renew(self, key: str, owner: str, ttl: float) -> bool:
+        """Extend a lease still held by ``owner``; False if it expired or was taken over."""
+        raise NotImplementedError
+
+    def release(self, key: str, owner: str):
+        """Drop a lease if ``owner`` still holds it."""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    async def aget_cookies(self):
+        return await asyncio.to_thread(self.get_cookies)
+
+    async def aset_cookies(self, cookies_data: list):
+        await asyncio.to_thread(self.set_cookies, cookies_data)
+
+    async def aclaim(self, key: str, owner: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self.claim, key, owner, ttl)
+
+    async def arenew(self, key: str, owner: str, ttl: float) -> bool:
+        return await asyncio.to_thread(self.renew, key, owner, ttl)
+
+    async def arelease(self, key: str, owner: str):
+        await asyncio.to_thread(self.release, key, owner)
+
+
+class DictSharedState(SharedState):
+    """Leases and cookies kept in a ``{"cookies": ..., "leases": {key: [owner, expires_at]}}`` dict.
+
+    Subclasses provide ``_transaction``, which yields that dict and persists it
+    afterwards while holding whatever lock makes the update atomic.
+    """
+
+    @contextmanager
+    def _transaction(self):
+        raise NotImplementedError
+
+    def get_cookies(self):
+        with self._transaction() as state:
+            return state.get("cookies")
+
+    def set_cookies(self, cookies_data):
+        with self._transaction() as state:
+            state["cookies"] = cookies_data
+
+    def claim(self, key, owner, ttl):
+        now = time.time()
+        with self._transaction() as state:
+            leases = state.setdefault("leases", {})
+            # Drop expired leases so the state does not grow with every finished range.
+            for name in [name for name, (_, expires_at) in leases.items() if expires_at <= now]:
+                del leases[name]
+            holder = leases.get(key)
+            if holder is not None and holder[0] != owner:
+                return False
+            leases[key] = [owner, now + ttl]
+            return True
+
+    def renew(self, key, owner, ttl):
+        now = time.time()
+        with self._transaction() as state:
+            holder = state.get("leases", {}).get(key)
+            if holder is None or holder[0] != owner or holder[1] <= now:
+                return False
+            holder[1] = now + ttl
+            return True
+
+    def release(self, key, owner):
+        with self._transaction() as state:
+            leases = state.get("leases", {})
+            holder = leases.get(key)
+            if holder is not None and holder[0] == owner:
+                del leases[key]
+
+
+class MemorySharedState(DictSharedState):
+    def __init__(self):
+        self._state: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            yield self._state
+
+
+class FileSharedState(DictSharedState):
+    """Keeps the state in one JSON file, rewritten atomically under ``<path>.lock``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = path + ".lock"
+        if fcntl is None:
+            logger.warning("fcntl is unavailable; the file shared state is only safe with a single worker.")
+
+    @contextmanager
+    def _transaction(self):
+        with file_lock(self.lock_path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    state = json.load(f)
+            except FileNotFoundError:
+                state = {}
+            except ValueError as e:
+                logger.warning(f"Discarding unreadable shared state {self.path}: {e}")
+                state = {}
+            before = json.dumps(state, sort_keys=True)
+            yield state
+            if json.dumps(state, sort_keys=True) != before:
+                write_json_atomic(self.path, state)
+
+
+class RedisSharedState(SharedState):
+    """Stores cookies and leases as keys on a Redis-compatible server.
+
+    Only GET/SET NX PX/PEXPIRE/DEL and WATCH/MULTI transactions are used, so
+    servers and stand-ins without Lua scripting work too. ``client`` may be any
+    object with the redis-py client API, e.g. ``fakeredis.FakeRedis()``.
+    """
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str) -> "RedisSharedState":
+        if redis is None:
+            raise RuntimeError("SHARED_STATE_BACKEND=redis requires the redis package to be installed.")
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def get_cookies(self):
+        raw = self.client.get(self._key("cookies"))
+        return None if raw is None else json.loads(raw)
+
+    def set_cookies(self, cookies_data):
+        self.client.set(self._key("cookies"), json.dumps(cookies_data))
+
+    def _if_owner(self, key: str, owner: str, action) -> bool:
+        """Run ``action(pipe)`` in a transaction only if ``key`` is still held by ``owner``."""
+        key = self._key(key)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    holder = pipe.get(key)
+                    if holder is None or holder.decode() != owner:
+                        pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    action(pipe, key)
+                    pipe.execute()
+                    return True
+                except redis.WatchError:
+                    continue
+
+    def claim(self, key, owner, ttl):
+        if self.client.set(self._key(key), owner, nx=True, px=int(ttl * 1000)):
+            return True
+        return self._if_owner(key, owner, lambda pipe, k: pipe.pexpire(k, int(ttl * 1000)))
+
+    def renew(self, key, owner, ttl):
+        return self._if_owner(key, owner, lambda pipe, k: pipe.pexpire(k, int(ttl * 1000)))
+
+    def release(self, key, owner):
+        self._if_owner(key, owner, lambda pipe, k: pipe.delete(k))
+
+    def close(self):
+        self.client.close()
+
+
+def open_shared_state(backend: Optional[str] = None) -> SharedState:
+    backend = backend or settings.SHARED_STATE_BACKEND
+    if backend == "file":
+        return FileSharedState(settings.SHARED_STATE_PATH)
+    if backend == "redis":
+        return RedisSharedState.from_url(settings.SHARED_STATE_URL, settings.SHARED_STATE_PREFIX)
+    if backend == "memory":
+        return MemorySharedState()
+    raise ValueError(f"Unknown SHARED_STATE_BACKEND {backend!r}.")
+
+
+shared_state = open_shared_state()
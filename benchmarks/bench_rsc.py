@@ -0,0 +1,55 @@
+"""Micro-benchmark of the review page parser against the line-splitting original.
+
+    python -m benchmarks.bench_rsc
+"""
+import json
+import time
+import tracemalloc
+
+from app.utils.rsc import orjson
+from app.utils.scraper import parse_review_page
+from benchmarks.fixtures import build_payloads
+
+
+def legacy_parse(raw_output_string: str):
+    extracted_data = None
+    for line in raw_output_string.splitlines():
+        stripped_line = line.strip()
+        if stripped_line.startswith("2:"):
+            extracted_data = stripped_line[2:].strip()
+            break
+    data = json.loads(extracted_data)
+    return data[0][3]["children"][0][3], data[0][3]["children"][1][3]["children"][3]["reviews"]["list"]
+
+
+def measure(name, fn, inputs, rounds=200):
+    for raw in inputs:
+        fn(raw)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for raw in inputs:
+            fn(raw)
+    per_page = (time.perf_counter() - start) / (rounds * len(inputs))
+
+    tracemalloc.start()
+    for raw in inputs:
+        tracemalloc.reset_peak()
+        fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<8} {per_page * 1e6:9.1f} us/page   peak alloc {peak / 1024:8.1f} KiB")
+    return per_page, peak
+
+
+def main():
+    payloads = build_payloads()
+    # The original parser worked on resp.text, so decoding is part of its cost.
+    legacy = measure("legacy", lambda raw: legacy_parse(raw.decode("utf-8")), payloads)
+    fast = measure("rsc", lambda raw: parse_review_page(raw, 1), payloads)
+    print(f"{len(payloads)} pages, {sum(map(len, payloads)) / len(payloads) / 1024:.1f} KiB avg, "
+          f"orjson={'yes' if orjson else 'no'}")
+    print(f"speedup {legacy[0] / fast[0]:.1f}x, allocation {legacy[1] / fast[1]:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""End-to-end scrape throughput against the local replay server.
+
+Drives the same review_feed.iter_reviews used by /api/v1/reviews (store and
+file output disabled) and writes pages/sec, per-page latency percentiles,
+peak RSS and login count per scenario to a JSON file so runs from different
+commits can be compared. Each scenario runs in a fresh interpreter against
+its own replay server process, so its peak RSS is its own and the server's
+memory and GIL time stay out of the figures.
+
+    python -m benchmarks.bench_scrape --pages 100 --windows 1,4,8 --output bench_results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import aclosing
+from datetime import timedelta
+from multiprocessing import get_context
+
+from app.core.config import settings
+from app.utils import playwright_utils, scraper
+from app.utils.http_pool import http_pool
+from app.utils.review_feed import iter_reviews
+from app.utils.shared_state import MemorySharedState
+from benchmarks.replay_server import SESSION_COOKIE, SESSION_VALUE, ReplayConfig
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Instrumented:
+    """Counts logins and times every page request made by the scraper."""
+
+    def __init__(self):
+        self.logins = 0
+        self.latencies = []
+        self._robust_request = scraper.robust_request
+
+    async def login(self):
+        self.logins += 1
+        return [{"name": SESSION_COOKIE, "value": SESSION_VALUE, "expires": time.time() + 86400}]
+
+    async def robust_request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self._robust_request(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    def install(self):
+        playwright_utils.login = self.login
+        scraper.robust_request = self.robust_request
+
+    def uninstall(self):
+        scraper.robust_request = self._robust_request
+
+
+def start_replay_server(config, port):
+    """Run benchmarks.replay_server in its own process and wait until it accepts connections."""
+    proc = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.replay_server", "--port", str(port), "--log-level", "error",
+        "--pages", str(config.pages), "--latency", str(config.latency),
+        "--error-rate", str(config.error_rate), "--burst-every", str(config.burst_every),
+    ])
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return proc
+        except OSError:
+            if proc.poll() is not None or time.monotonic() > deadline:
+                proc.kill()
+                raise RuntimeError(f"Replay server on port {port} did not start.")
+            time.sleep(0.05)
+
+
+def replay_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/stats") as resp:
+        return json.load(resp)
+
+
+async def run_scenario(name, base_url, window, config):
+    settings.TEAMBLIND_BASE_URL = base_url
+    settings.PAGE_FETCH_WINDOW = window
+    # Each scenario runs in a fresh process, so it logs in once like a cold start.
+    playwright_utils.cookie_manager = playwright_utils.CookieManager(settings.COOKIE_REFRESH_MARGIN, MemorySharedState())
+
+    instrumented = Instrumented()
+    instrumented.install()
+    last_date = (config.newest - timedelta(days=config.pages * config.reviews_per_page / config.reviews_per_day)).date()
+    pages = reviews = 0
+    started = time.perf_counter()
+    try:
+        batches = iter_reviews(f"Bench{name}", config.newest.date(), last_date)
+        async with aclosing(batches):
+            async for batch in batches:
+                pages += 1
+                reviews += len(batch.reviews)
+    finally:
+        instrumented.uninstall()
+    elapsed = time.perf_counter() - started
+    pool = http_pool.stats()
+    await http_pool.close()
+
+    return {
+        "scenario": name,
+        "window": window,
+        "pages": pages,
+        "reviews": reviews,
+        "seconds": round(elapsed, 3),
+        "pages_per_second": round(pages / elapsed, 2),
+        "page_latency_p50_ms": round(percentile(instrumented.latencies, 0.5) * 1000, 1),
+        "page_latency_p99_ms": round(percentile(instrumented.latencies, 0.99) * 1000, 1),
+        "logins": instrumented.logins,
+        "connection_reuse_ratio": pool["reuse_ratio"],
+    }
+
+
+def scenario_process(name, base_url, window, config, rps):
+    """Entry point of the child process running one scenario."""
+    settings.REVIEW_STORE_ENABLED = False
+    settings.PAGE_LOCATOR_ENABLED = False
+    settings.HOST_REQUESTS_PER_SECOND = rps
+    settings.RETRY_BACKOFF_BASE = 0.05
+    playwright_utils.STATE_FILE = "/nonexistent/auth_state.json"  # always exercise the login path once
+    result = asyncio.run(run_scenario(name, base_url, window, config))
+    # The peak of this interpreter only: spawned, so nothing is inherited from the parent.
+    result["peak_rss_mib"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--windows", default="1,4,8")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="used by the 'errors' scenarios")
+    parser.add_argument("--burst-every", type=int, default=40, help="used by the 'throttled' scenarios")
+    parser.add_argument("--rps", type=float, default=0, help="HOST_REQUESTS_PER_SECOND (0 = no cap)")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    scenarios = []
+    for window in (int(w) for w in args.windows.split(",")):
+        scenarios.append(("clean", window, {}))
+        scenarios.append(("errors", window, {"error_rate": args.error_rate}))
+        scenarios.append(("throttled", window, {"burst_every": args.burst_every}))
+
+    results = []
+    for name, window, knobs in scenarios:
+        config = ReplayConfig(pages=args.pages, latency=args.latency, **knobs)
+        server = start_replay_server(config, args.port)
+        try:
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(scenario_process, name, base_url, window, config, args.rps).result()
+            stats = replay_stats(base_url)
+        finally:
+            server.terminate()
+            server.wait()
+        result["server_requests"] = stats["requests"]
+        result["server_statuses"] = dict(sorted(stats["statuses"].items(), key=lambda item: int(item[0])))
+        results.append(result)
+        print(
+            f"{name:<10} window={window:<3} {result['pages_per_second']:8.2f} pages/s  "
+            f"p50={result['page_latency_p50_ms']:7.1f}ms p99={result['page_latency_p99_ms']:8.1f}ms  "
+            f"requests={result['server_requests']:<5} logins={result['logins']} rss={result['peak_rss_mib']}MiB"
+        )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "replay": {"pages": args.pages, "latency": args.latency, "rps": args.rps},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
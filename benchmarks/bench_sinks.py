@@ -0,0 +1,78 @@
+"""Bytes on disk and load time of each output sink for a large scrape.
+
+    python -m benchmarks.bench_sinks [reviews]
+"""
+import asyncio
+import glob
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+from app.core.config import settings
+from app.utils import output_sinks
+from benchmarks.fixtures import load_overall, load_pages
+
+PAGE_SIZE = 10
+
+
+def make_reviews(count):
+    source = [review for page in load_pages() for review in page]
+    return [dict(source[i % len(source)]) for i in range(count)]
+
+
+async def write(output_format, overall, reviews):
+    sink = await output_sinks.aopen_sink("Amazon", output_format)
+    started = time.perf_counter()
+    await sink.write_overall(overall)
+    for page, start in enumerate(range(0, len(reviews), PAGE_SIZE), start=1):
+        await sink.write_page(page, reviews[start:start + PAGE_SIZE])
+    await sink.close()
+    return time.perf_counter() - started
+
+
+def load(output_format):
+    if output_format == "pages":
+        rows = []
+        for path in glob.glob("Amazon/page_*.json"):
+            if not path.endswith("page_0.json"):
+                with open(path, encoding="utf-8") as f:
+                    rows.extend(json.load(f))
+        return len(rows)
+    if output_format == "ndjson":
+        with gzip.open(os.path.join(settings.OUTPUT_DIR, "Amazon", "reviews.ndjson.gz"), "rb") as f:
+            return sum(1 for line in f if json.loads(line))
+    table = output_sinks.pq.read_table(os.path.join(settings.OUTPUT_DIR, "Amazon", "reviews.parquet"))
+    return table.num_rows
+
+
+def disk_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    overall, reviews = load_overall(), make_reviews(count)
+    formats = ["pages", "ndjson"] + (["parquet"] if output_sinks.pa is not None else [])
+    print(f"{count} reviews")
+    for output_format in formats:
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            settings.OUTPUT_DIR = os.path.join(tmp, "output")
+            try:
+                write_seconds = asyncio.run(write(output_format, overall, reviews))
+                started = time.perf_counter()
+                rows = load(output_format)
+                load_seconds = time.perf_counter() - started
+                size = disk_bytes(tmp)
+            finally:
+                os.chdir(cwd)
+        assert rows == count, (output_format, rows)
+        print(f"{output_format:<8} {size / 2**20:8.2f} MiB   write {write_seconds:6.2f}s   load {load_seconds:6.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Per-review cost of validating and date-filtering scraped pages, before and after.
+
+    python -m benchmarks.bench_validation [reviews]
+"""
+import sys
+import time
+
+from app.schema.review_model import Model
+from app.utils.scraper import parse_created_at, select_window
+from benchmarks.fixtures import load_pages
+
+PAGE_SIZE = 10
+
+
+def make_pages(count):
+    source = [review for page in load_pages() for review in page]
+    reviews = [dict(source[i % len(source)]) for i in range(count)]
+    return [reviews[start:start + PAGE_SIZE] for start in range(0, count, PAGE_SIZE)]
+
+
+def legacy_select(reviews, start_date, last_date):
+    page_reviews = []
+    for review in reviews:
+        review_obj = Model(**review).model_dump()
+        created_at = parse_created_at(review_obj["createdAt"])
+        if last_date <= created_at <= start_date:
+            page_reviews.append(review_obj)
+    return page_reviews
+
+
+def measure(name, fn, pages, start_date, last_date, rounds=5):
+    kept = sum(len(fn(page, start_date, last_date)) for page in pages)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            fn(page, start_date, last_date)
+    per_review = (time.perf_counter() - started) / (rounds * sum(map(len, pages)))
+    print(f"{name:<8} {per_review * 1e6:7.2f} us/review   kept {kept}")
+    return per_review, kept
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    pages = make_pages(count)
+    dates = sorted(parse_created_at(review["createdAt"]) for page in pages for review in page)
+    # A window around the middle of the data so both the keep and drop branches run.
+    start_date, last_date = dates[len(dates) * 3 // 4], dates[len(dates) // 4]
+    print(f"{count} reviews in pages of {PAGE_SIZE}, window {last_date} .. {start_date}")
+    legacy = measure("legacy", legacy_select, pages, start_date, last_date)
+    fast = measure("adapter", select_window, pages, start_date, last_date)
+    assert legacy[1] == fast[1], "filters disagree"
+    assert [legacy_select(p, start_date, last_date) for p in pages[:50]] == \
+        [select_window(p, start_date, last_date) for p in pages[:50]], "outputs differ"
+    print(f"speedup {legacy[0] / fast[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
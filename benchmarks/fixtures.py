@@ -0,0 +1,60 @@
+"""Synthetic flight responses built from the captured ``Amazon/page_*.json`` data."""
+import glob
+import json
+import os
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(ROOT, "Amazon")
+
+
+def load_overall() -> Dict[str, Any]:
+    with open(os.path.join(FIXTURE_DIR, "page_0.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_pages() -> List[List[Dict[str, Any]]]:
+    pages = []
+    paths = glob.glob(os.path.join(FIXTURE_DIR, "page_*.json"))
+    for path in sorted(paths, key=lambda p: int(p.rsplit("_", 1)[1].split(".")[0])):
+        if path.endswith("page_0.json"):
+            continue
+        with open(path, encoding="utf-8") as f:
+            pages.append(json.load(f))
+    return pages
+
+
+def build_payload(overall: Dict[str, Any], reviews: List[Dict[str, Any]], filler_rows: int = 40) -> bytes:
+    """Wrap one page of reviews in the row layout teamblind.com serves.
+
+    Row 2 holds the page tree the scraper reads; the surrounding rows stand in
+    for the client references, text chunks and component trees of a real page.
+    """
+    tree = [["$", "div", None, {"children": [
+        ["$", "$L5", None, overall],
+        ["$", "section", None, {"children": [
+            ["$", "h2", None, {"children": "Reviews"}],
+            ["$", "$L6", None, {}],
+            ["$", "$L7", None, {}],
+            {"reviews": {"list": reviews, "total": overall.get("count")}},
+        ]}],
+    ]}]]
+    rows = [
+        b'0:["$@1",["build-id",null]]',
+        b'1:I[12345,["static/chunks/app-1.js","static/chunks/app-2.js"],"default"]',
+        b"2:" + json.dumps(tree, ensure_ascii=False).encode("utf-8"),
+    ]
+    for i in range(filler_rows):
+        row_id = format(8 + i, "x")
+        if i % 4 == 0:
+            text = ("Company review guidelines and disclaimer text.\n" * 20).encode("utf-8")
+            rows.append(row_id.encode() + b":T" + format(len(text), "x").encode() + b"," + text)
+        else:
+            node = ["$", "div", None, {"className": f"c{i}", "children": [["$", "span", None, {"children": "x" * 80}]] * 8}]
+            rows.append(row_id.encode() + b":" + json.dumps(node).encode("utf-8"))
+    return b"\n".join(rows) + b"\n"
+
+
+def build_payloads() -> List[bytes]:
+    overall = load_overall()
+    return [build_payload(overall, reviews) for reviews in load_pages()]
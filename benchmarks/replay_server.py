@@ -0,0 +1,168 @@
+"""Local stand-in for teamblind.com serving flight responses for the review pages.
+
+Pages are built from the ``Amazon/`` fixtures with ``createdAt`` rewritten so
+that reviews are newest first and ``reviews_per_day`` apart, or served
+verbatim from a directory of recorded ``page_<N>.rsc`` responses. Responses
+queued with ``ReplayServer.script`` are served first, in order. ``GET /stats``
+returns the request and status counts.
+
+    python -m benchmarks.replay_server --port 8900 --pages 200 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from benchmarks.fixtures import build_payload, load_overall, load_pages
+
+SESSION_COOKIE = "bl_session_v2"
+SESSION_VALUE = "replay-session"
+
+
+@dataclass
+class ReplayConfig:
+    pages: int = 100
+    reviews_per_page: int = 10
+    reviews_per_day: int = 2
+    newest: datetime = datetime(2025, 5, 20, tzinfo=timezone.utc)
+    latency: float = 0.05  # seconds added to every response
+    error_rate: float = 0.0  # share of responses that are a 500
+    burst_every: int = 0  # start a burst of 429s every N requests (0 = never)
+    burst_length: int = 3
+    retry_after: int = 1
+    recordings: Optional[str] = None  # directory of page_<N>.rsc files served verbatim
+    seed: int = 0
+
+
+class ReplayServer:
+    def __init__(self, config: ReplayConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+        self.overall = load_overall()
+        self.source = [review for page in load_pages() for review in page]
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        self.sessions: List[Optional[str]] = []  # session cookie sent with each request
+        self._scripted = deque()
+        self._burst_left = 0
+        self._cache: Dict[int, bytes] = {}
+        self.app = Starlette(routes=[
+            Route("/company/{company}/reviews", self.reviews),
+            Route("/stats", self.stats),
+        ])
+        self._server: Optional[uvicorn.Server] = None
+
+    def payload(self, page: int) -> bytes:
+        cached = self._cache.get(page)
+        if cached is not None:
+            return cached
+        config = self.config
+        if config.recordings:
+            path = os.path.join(config.recordings, f"page_{page}.rsc")
+            body = open(path, "rb").read() if os.path.exists(path) else build_payload(self.overall, [])
+        else:
+            reviews = []
+            if page <= config.pages:
+                step = timedelta(days=1) / config.reviews_per_day
+                for i in range((page - 1) * config.reviews_per_page, page * config.reviews_per_page):
+                    review = dict(self.source[i % len(self.source)])
+                    review["createdAt"] = (config.newest - i * step).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+                    reviews.append(review)
+            body = build_payload(self.overall, reviews)
+        self._cache[page] = body
+        return body
+
+    def script(self, *responses):
+        """Queue ``status`` or ``(status, headers)`` responses to serve before anything else."""
+        for response in responses:
+            self._scripted.append(response if isinstance(response, tuple) else (response, {}))
+
+    def reset(self):
+        self.requests, self.statuses = 0, {}
+        self.sessions.clear()
+        self._scripted.clear()
+
+    def _status(self, request: Request) -> int:
+        if request.cookies.get(SESSION_COOKIE) != SESSION_VALUE:
+            return 401
+        config = self.config
+        if config.burst_every and self.requests % config.burst_every == 0:
+            self._burst_left = config.burst_length
+        if self._burst_left:
+            self._burst_left -= 1
+            return 429
+        if config.error_rate and self.random.random() < config.error_rate:
+            return 500
+        return 200
+
+    async def reviews(self, request: Request) -> Response:
+        self.requests += 1
+        self.sessions.append(request.cookies.get(SESSION_COOKIE))
+        if self._scripted:
+            status, headers = self._scripted.popleft()
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status != 200:
+                return Response(status_code=status, headers=headers)
+            page = int(request.query_params.get("page", "1"))
+            return Response(self.payload(page), media_type="text/x-component", headers=headers)
+        status = self._status(request)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if self.config.latency:
+            await asyncio.sleep(self.config.latency)
+        if status == 429:
+            return Response(status_code=429, headers={"Retry-After": str(self.config.retry_after)})
+        if status != 200:
+            return Response(status_code=status)
+        page = int(request.query_params.get("page", "1"))
+        return Response(self.payload(page), media_type="text/x-component")
+
+    async def stats(self, request: Request) -> JSONResponse:
+        return JSONResponse({"requests": self.requests, "statuses": self.statuses})
+
+    def start_in_thread(self, host: str = "127.0.0.1", port: int = 8900) -> str:
+        """Serve from a daemon thread and return the base URL once it accepts connections."""
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="error"))
+        threading.Thread(target=self._server.run, daemon=True).start()
+        while not self._server.started:
+            time.sleep(0.05)
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--burst-every", type=int, default=0)
+    parser.add_argument("--burst-length", type=int, default=3)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--recordings")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    config = ReplayConfig(
+        pages=args.pages, latency=args.latency, error_rate=args.error_rate, burst_every=args.burst_every,
+        burst_length=args.burst_length, retry_after=args.retry_after, recordings=args.recordings,
+    )
+    uvicorn.run(ReplayServer(config).app, host=args.host, port=args.port, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,51 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.api.v1.reviews import ReviewRouter
+from app.api.v1.jobs import JobRouter
+from app.api.v1.stats import StatsRouter
+from app.utils.http_pool import http_pool
+from app.utils.review_store import review_store
+from app.utils.playwright_utils import cookie_manager
+from app.utils.browser_pool import browser_pool
+from app.utils.jobs import job_manager
+from app.utils.shared_state import shared_state
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await http_pool.start()
+    await browser_pool.start()
+    await cookie_manager.start()
+    await job_manager.start()
+    try:
+        yield
+    finally:
+        await job_manager.stop()
+        await cookie_manager.stop()
+        await browser_pool.close()
+        await http_pool.close()
+        review_store.close()
+        shared_state.close()
+
 
 app = FastAPI(
     title="TeamBlind Data Scraper API",
     description="",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 app.include_router(ReviewRouter, prefix="/api/v1")
+app.include_router(JobRouter, prefix="/api/v1")
+app.include_router(StatsRouter, prefix="/api/v1")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/", include_in_schema=False)
 async def root():
-    return RedirectResponse(url="/docs")
\ No newline at end of file
+    return RedirectResponse(url="/docs")
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import socket
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Settings requires these; set them before anything imports app.core.config.
+os.environ.setdefault("TEAMBLIND_USER_EMAIL", "test@example.com")
+os.environ.setdefault("TEAMBLIND_USER_PASS", "test")
+os.environ.setdefault("PORT", "8000")
+
+from app.core.config import settings
+from app.utils import playwright_utils, rate_limit
+from app.utils.http_pool import http_pool
+from app.utils.shared_state import MemorySharedState
+from benchmarks.replay_server import SESSION_COOKIE, SESSION_VALUE, ReplayConfig, ReplayServer
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run(coro):
+    """Run ``coro`` in a fresh event loop, closing the pooled HTTP sessions bound to it."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await http_pool.close()
+    return asyncio.run(main())
+
+
+def session(value=SESSION_VALUE, ttl=3600):
+    return [{"name": SESSION_COOKIE, "value": value, "expires": time.time() + ttl}]
+
+
+@pytest.fixture(scope="session")
+def replay_server():
+    server = ReplayServer(ReplayConfig(pages=5, latency=0))
+    base_url = server.start_in_thread(port=free_port())
+    yield SimpleNamespace(server=server, base_url=base_url)
+    server.stop()
+
+
+@pytest.fixture
+def scraper_env(replay_server, monkeypatch, tmp_path):
+    """A fresh cookie manager, per-host limiter and counted fake login against the replay server."""
+    replay_server.server.reset()
+    monkeypatch.setattr(settings, "HOST_REQUESTS_PER_SECOND", 0)
+    monkeypatch.setattr(settings, "RETRY_BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(settings, "RETRY_BACKOFF_MAX", 0.05)
+    monkeypatch.setattr(rate_limit, "_limiters", {})
+    monkeypatch.setattr(playwright_utils, "STATE_FILE", str(tmp_path / "auth_state.json"))
+
+    env = SimpleNamespace(
+        server=replay_server.server,
+        url=f"{replay_server.base_url}/company/Test/reviews?page=1",
+        logins=0,
+        login_value=SESSION_VALUE,
+    )
+
+    async def login():
+        env.logins += 1
+        return session(env.login_value)
+
+    monkeypatch.setattr(playwright_utils, "login", login)
+    env.cookie_manager = playwright_utils.CookieManager(settings.COOKIE_REFRESH_MARGIN, MemorySharedState())
+    monkeypatch.setattr(playwright_utils, "cookie_manager", env.cookie_manager)
+    return env
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.utils import jobs
+from app.utils.jobs import DONE, JobManager, JobTask
+from app.utils.review_store import ReviewStore
+from app.utils.shared_state import MemorySharedState
+from tests.conftest import run
+
+# The replay fixture serves 5 pages of 10 reviews, two a day, newest on 2025-05-20.
+NEWEST, OLDEST = date(2025, 5, 20), date(2025, 4, 26)
+
+
+@pytest.fixture
+def job_env(scraper_env, replay_server, monkeypatch, tmp_path):
+    """Jobs scraping the replay server with private review and job stores."""
+    monkeypatch.setattr(settings, "TEAMBLIND_BASE_URL", replay_server.base_url)
+    monkeypatch.setattr(settings, "PAGE_LOCATOR_ENABLED", False)
+    monkeypatch.setattr(settings, "JOB_PARTITION", "none")
+    monkeypatch.setattr(settings, "JOB_POLL_INTERVAL", 30.0)
+    monkeypatch.setattr(jobs, "review_store", ReviewStore(str(tmp_path / "reviews.db"), 3600))
+    monkeypatch.setattr(jobs, "shared_state", MemorySharedState())
+    scraper_env.jobs_path = str(tmp_path / "jobs.db")
+    yield scraper_env
+    jobs.review_store.close()
+
+
+def test_multi_slice_job_does_not_wait_for_the_poll_interval(job_env):
+    manager = JobManager(job_env.jobs_path, workers=4, slice_pages=2)
+
+    async def main():
+        await manager.start()
+        try:
+            job = await manager.submit([SimpleNamespace(company_code="Test", start_date=NEWEST, last_date=OLDEST)])
+            while (await manager.get(job.id)).status != DONE:
+                await asyncio.sleep(0.05)
+            return await manager.get(job.id)
+        finally:
+            await manager.stop()
+
+    started = time.monotonic()
+    job = run(main())
+    # Three slices; each must be picked up again as soon as its lease is released.
+    assert time.monotonic() - started < 5
+    assert job.tasks[0].pages_done == 5
+
+
+def test_slice_page_budget_spans_segments(job_env):
+    # Covering the middle of the window splits the task into two missing segments.
+    jobs.review_store.add_coverage("Test", date(2025, 5, 12), date(2025, 5, 8), time.time())
+    manager = JobManager(job_env.jobs_path, workers=1, slice_pages=3)
+    task = JobTask("job", 0, "Test", NEWEST.isoformat(), OLDEST.isoformat())
+
+    async def main():
+        assert await jobs.shared_state.aclaim(task.lease_key, "owner", 60)
+        return await manager._run_slice(task, "owner")
+
+    assert run(main()) is False
+    # The first segment ends on page 2; the slice then gets one page of the second.
+    assert task.pages_done == 3
+    assert task.segments == [["2025-05-07", "2025-04-26"]]
+    assert task.next_page == 2
+    manager.store.close()
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.utils.rate_limit import AdaptiveRateLimiter, parse_retry_after
+
+
+def make_limiter(max_rate=0.0):
+    return AdaptiveRateLimiter(max_rate, min_rate=0.2, increase=0.1, initial_rate=5.0)
+
+
+def test_first_throttle_of_an_unmeasured_host_starts_from_the_initial_rate():
+    limiter = make_limiter()
+    asyncio.run(limiter.acquire())
+    limiter.on_throttle()
+    assert limiter.rate == pytest.approx(2.5)
+
+
+def test_idle_gap_does_not_dilute_the_measured_rate():
+    limiter = make_limiter()
+
+    async def burst_then_idle():
+        for _ in range(40):
+            await limiter.acquire()
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(limiter.RATE_WINDOW + 0.5)
+
+    asyncio.run(burst_then_idle())
+    limiter.on_throttle()
+    # ~100/s was sent before the pause; halving it should stay far above the initial rate.
+    assert limiter.rate > 20
+
+
+def test_throttle_never_goes_below_the_floor():
+    limiter = make_limiter(max_rate=0.3)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.rate == pytest.approx(0.2)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,113 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.utils.playwright_utils import AuthenticationFailed, RetryBudgetExceeded, robust_request
+from app.utils.rate_limit import get_host_limiter
+from tests.conftest import free_port, run, session
+
+
+def test_retry_after_pauses_the_whole_host(scraper_env):
+    scraper_env.server.script((429, {"Retry-After": "1"}))
+
+    async def timed_request(delay):
+        await asyncio.sleep(delay)
+        started = time.monotonic()
+        resp = await robust_request(scraper_env.url)
+        return resp.status_code, time.monotonic() - started
+
+    async def main():
+        return await asyncio.gather(timed_request(0), timed_request(0.2))
+
+    (first_status, first), (second_status, second) = run(main())
+    assert first_status == second_status == 200
+    assert first >= 1.0
+    # The second request never saw a 429 but still waits out the host's pause.
+    assert second >= 0.7
+    assert scraper_env.server.statuses == {429: 1, 200: 2}
+    assert get_host_limiter(scraper_env.url).throttles == 1
+
+
+def test_5xx_halves_the_rate_and_successes_recover_it(scraper_env, monkeypatch):
+    monkeypatch.setattr(settings, "HOST_REQUESTS_PER_SECOND", 10.0)
+    monkeypatch.setattr(settings, "HOST_RATE_INCREASE", 1.0)
+    limiter = get_host_limiter(scraper_env.url)
+    scraper_env.server.script(503)
+
+    async def main():
+        await robust_request(scraper_env.url)
+        after_error = limiter.rate
+        for _ in range(6):
+            await robust_request(scraper_env.url)
+        return after_error
+
+    after_error = run(main())
+    assert after_error == pytest.approx(6.0)  # halved to 5, then +1 for the successful retry
+    assert limiter.rate == pytest.approx(10.0)  # recovered, capped at the configured maximum
+
+
+def test_deadline_stops_retrying(scraper_env):
+    scraper_env.server.script(*[(503, {"Retry-After": "5"})] * 3)
+    started = time.monotonic()
+    with pytest.raises(RetryBudgetExceeded):
+        run(robust_request(scraper_env.url, deadline=1))
+    # Waiting out Retry-After would overrun the deadline, so it gives up at once.
+    assert time.monotonic() - started < 1
+    assert scraper_env.server.requests == 1
+
+
+def test_max_retries_stops_retrying(scraper_env):
+    scraper_env.server.script(*[503] * 5)
+    with pytest.raises(RetryBudgetExceeded):
+        run(robust_request(scraper_env.url, max_retries=2))
+    assert scraper_env.server.requests == 3
+
+
+def test_server_errors_keep_the_session(scraper_env):
+    scraper_env.server.script(500, 502)
+
+    async def main():
+        before = await scraper_env.cookie_manager.get()
+        await robust_request(scraper_env.url)
+        return before, await scraper_env.cookie_manager.get()
+
+    before, after = run(main())
+    assert after is before
+    assert scraper_env.logins == 1
+    assert scraper_env.server.statuses == {500: 1, 502: 1, 200: 1}
+
+
+def test_network_errors_keep_the_session(scraper_env):
+    url = f"http://127.0.0.1:{free_port()}/company/Test/reviews?page=1"
+
+    async def main():
+        before = await scraper_env.cookie_manager.get()
+        with pytest.raises(RetryBudgetExceeded):
+            await robust_request(url, max_retries=2)
+        return before, await scraper_env.cookie_manager.get()
+
+    before, after = run(main())
+    assert after is before
+    assert scraper_env.logins == 1
+
+
+def test_401_logs_in_once_and_retries(scraper_env):
+    scraper_env.cookie_manager._set(session("stale-session"))
+    resp = run(robust_request(scraper_env.url))
+    assert resp.status_code == 200
+    assert scraper_env.logins == 1
+    assert scraper_env.server.statuses == {401: 1, 200: 1}
+
+
+def test_rejected_fresh_session_does_not_log_in_again(scraper_env):
+    scraper_env.login_value = "rejected-session"
+
+    async def main():
+        return await asyncio.gather(*(robust_request(scraper_env.url) for _ in range(4)), return_exceptions=True)
+
+    results = run(main())
+    assert all(isinstance(result, AuthenticationFailed) for result in results)
+    assert scraper_env.logins == 1
+    assert scraper_env.server.statuses == {401: 4}